@@ -120,6 +120,7 @@ class Container:
         return ChromaDBRAGAdapter(
             self.config.rag,
             self.embeddings,
+            output_dir=self.config.persistence.output_dir,
         )
 
     @cached_property
@@ -127,7 +128,7 @@ class Container:
         """Project analyzer for static analysis."""
         from src.infrastructure.analyzer.project_analyzer import ProjectAnalyzer
 
-        return ProjectAnalyzer()
+        return ProjectAnalyzer(cache_dir=self.config.persistence.output_dir)
 
     @cached_property
     def code_security_checker(self) -> "CodeSecurityChecker":
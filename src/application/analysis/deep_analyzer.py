@@ -35,6 +35,7 @@ from src.infrastructure.analyzer.dependency_graph import (
     build_dependency_graph,
     format_dependency_graph_markdown,
 )
+from src.infrastructure.analyzer.parsed_file import ParsedFileCache
 from src.infrastructure.analyzer.report_generator import ReportGenerator
 from src.infrastructure.services.git_service import GitService
 
@@ -209,11 +210,15 @@ class DeepAnalyzer:
             from src.infrastructure.analyzer.project_analyzer import ProjectAnalyzer
             self._analyzer = ProjectAnalyzer()
 
-        analysis = await asyncio.to_thread(self._analyzer.analyze, str(project_path))
+        # Общий кэш: граф зависимостей переиспользует AST, построенные при статическом анализе
+        parsed_cache = ParsedFileCache()
+        analysis = await asyncio.to_thread(self._analyzer.analyze, str(project_path), parsed_cache)
         generator = ReportGenerator()
         static_report = generator.generate_markdown(analysis)
 
-        dep_result = await asyncio.to_thread(build_dependency_graph, str(project_path))
+        dep_result = await asyncio.to_thread(
+            build_dependency_graph, str(project_path), parsed_cache, self._analyzer.cache_dir
+        )
         dep_section = format_dependency_graph_markdown(dep_result)
         if dep_section:
             static_report = f"{static_report}\n\n{dep_section}"
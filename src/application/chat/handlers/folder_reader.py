@@ -85,13 +85,13 @@ class FolderReaderHandler(CommandHandler):
                     break
                 if total_chars >= MAX_TOTAL_CHARS:
                     break
-                if not p.is_file():
+                # Skip unsupported extensions (before is_file: no stat for skipped paths)
+                if p.suffix.lower() not in SUPPORTED_EXTENSIONS:
                     continue
                 # Skip excluded dirs
-                if any(part in EXCLUDED_DIRS for part in p.relative_to(base).parts):
+                if not EXCLUDED_DIRS.isdisjoint(p.relative_to(base).parts):
                     continue
-                # Skip unsupported extensions
-                if p.suffix.lower() not in SUPPORTED_EXTENSIONS:
+                if not p.is_file():
                     continue
 
                 try:
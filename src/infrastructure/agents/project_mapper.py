@@ -1,13 +1,80 @@
 """Project Mapper - generates project structure map for context."""
 
 import ast
+import asyncio
+import hashlib
+import io
 import json
 import logging
-from dataclasses import asdict, dataclass, field
+import re
+import sys
+from collections import defaultdict
+from dataclasses import dataclass, field, is_dataclass, replace
+from functools import lru_cache
 from pathlib import Path
 
+try:
+    import orjson
+except ImportError:  # optional speedup, stdlib json is the fallback
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
+ANALYSIS_CACHE_FILENAME = "file_analysis_cache.json"
+
+# Bump when analyze_file output changes: caches written with another version are ignored.
+# 2: only module-level imports and top-level/class-level defs are recorded.
+ANALYSIS_CACHE_VERSION = 2
+
+# Project roots kept in the analysis cache; the least recently built are dropped first
+MAX_CACHED_ROOTS = 20
+
+# Top-level TS/JS declarations: imports, (exported) functions and classes, exported const/let
+_TS_DECLARATION_RE = re.compile(
+    r"""^[ \t]*(?:
+        import\s+[^'";]*?\bfrom\s*['"](?P<import>[^'"]+)['"]
+      | (?P<export>export\s+(?:default\s+)?)?(?:
+            (?P<async>async\s+)?function\b\*?\s*(?P<function>[\w$]+)
+          | (?:abstract\s+)?class\s+(?P<class>[\w$]+)(?:\s*<[^>{]*>)?(?:\s+extends\s+(?P<base>[\w$.]+))?
+        )
+      | export\s+(?:const|let)\s+(?P<variable>[\w$]+)
+    )""",
+    re.MULTILINE | re.VERBOSE,
+)
+
+
+def _encode_dataclass(obj: object) -> dict:
+    """Json default hook: serialize dataclasses via their __dict__ without copying."""
+    if is_dataclass(obj) and not isinstance(obj, type):
+        return obj.__dict__
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def _json_dumps(obj: object, indent: bool = False) -> bytes:
+    """Serialize to UTF-8 JSON bytes, using orjson when available.
+
+    Dataclasses are encoded directly (natively by orjson), with no intermediate dict tree.
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0)
+    return json.dumps(obj, indent=2 if indent else None, default=_encode_dataclass).encode("utf-8")
+
+
+def _json_dump_file(obj: object, path: Path, indent: bool = False) -> None:
+    """Write JSON to path; the stdlib fallback streams chunks instead of building one string."""
+    if orjson is not None:
+        path.write_bytes(_json_dumps(obj, indent=indent))
+        return
+    with path.open("w", encoding="utf-8") as fp:
+        json.dump(obj, fp, indent=2 if indent else None, default=_encode_dataclass)
+
+
+def _json_loads(data: bytes) -> object:
+    """Parse JSON bytes, using orjson when available."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
 
 @dataclass
 class FunctionInfo:
@@ -20,6 +87,17 @@ class FunctionInfo:
     is_async: bool = False
     decorators: list[str] = field(default_factory=list)
 
+    def to_dict(self) -> dict:
+        """Return function info as plain dictionary (lists are shared, not copied)."""
+        return {
+            "name": self.name,
+            "args": self.args,
+            "returns": self.returns,
+            "docstring": self.docstring,
+            "is_async": self.is_async,
+            "decorators": self.decorators,
+        }
+
 
 @dataclass
 class ClassInfo:
@@ -30,6 +108,15 @@ class ClassInfo:
     docstring: str | None = None
     methods: list[str] = field(default_factory=list)
 
+    def to_dict(self) -> dict:
+        """Return class info as plain dictionary (lists are shared, not copied)."""
+        return {
+            "name": self.name,
+            "bases": self.bases,
+            "docstring": self.docstring,
+            "methods": self.methods,
+        }
+
 
 @dataclass
 class FileInfo:
@@ -43,6 +130,31 @@ class FileInfo:
     exports: list[str] = field(default_factory=list)  # For JS/TS
     summary: str = ""
 
+    def to_dict(self) -> dict:
+        """Return file info as plain dictionary without deep-copying nested lists."""
+        return {
+            "path": self.path,
+            "language": self.language,
+            "imports": self.imports,
+            "classes": [c.to_dict() for c in self.classes],
+            "functions": [fn.to_dict() for fn in self.functions],
+            "exports": self.exports,
+            "summary": self.summary,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "FileInfo":
+        """Reconstruct file info from dictionary produced by to_dict."""
+        return cls(
+            path=data["path"],
+            language=sys.intern(data["language"]),
+            imports=[sys.intern(i) for i in data.get("imports", [])],
+            classes=[ClassInfo(**c) for c in data.get("classes", [])],
+            functions=[FunctionInfo(**fn) for fn in data.get("functions", [])],
+            exports=data.get("exports", []),
+            summary=data.get("summary", ""),
+        )
+
 
 @dataclass
 class ProjectMap:
@@ -53,78 +165,162 @@ class ProjectMap:
     stats: dict = field(default_factory=dict)
 
     def to_dict(self) -> dict:
-        """Return project map as dictionary."""
-        return asdict(self)
+        """Return project map as dictionary.
+
+        Built by direct attribute access instead of dataclasses.asdict, which
+        deep-copies every nested dataclass and list.
+        """
+        return {
+            "root_path": self.root_path,
+            "files": [f.to_dict() for f in self.files],
+            "stats": self.stats,
+        }
 
     def to_json(self) -> str:
         """Return project map as JSON string."""
-        return json.dumps(self.to_dict(), indent=2)
+        return _json_dumps(self, indent=True).decode("utf-8")
 
     def to_markdown(self) -> str:
         """Generate markdown representation of project map."""
-        lines = [
-            f"# Project Map: {self.root_path}",
-            "",
-            "## Statistics",
-            f"- Total files: {self.stats.get('total_files', 0)}",
-            f"- Total classes: {self.stats.get('total_classes', 0)}",
-            f"- Total functions: {self.stats.get('total_functions', 0)}",
-            "",
-            "## Structure",
-            "",
-        ]
-
-        # Group by directory
-        by_dir: dict[str, list[FileInfo]] = {}
+        buf = io.StringIO()
+        w = buf.write
+        w(
+            f"# Project Map: {self.root_path}\n"
+            "\n"
+            "## Statistics\n"
+            f"- Total files: {self.stats.get('total_files', 0)}\n"
+            f"- Total classes: {self.stats.get('total_classes', 0)}\n"
+            f"- Total functions: {self.stats.get('total_functions', 0)}\n"
+            "\n"
+            "## Structure\n"
+            "\n"
+        )
+
+        # Group by directory (Path built once per file, reused for name)
+        by_dir: defaultdict[str, list[tuple[str, FileInfo]]] = defaultdict(list)
         for f in self.files:
-            dir_path = str(Path(f.path).parent)
-            if dir_path not in by_dir:
-                by_dir[dir_path] = []
-            by_dir[dir_path].append(f)
+            file_path = Path(f.path)
+            by_dir[str(file_path.parent)].append((file_path.name, f))
 
         for dir_path in sorted(by_dir.keys()):
             if dir_path == ".":
-                lines.append("### Root")
+                w("### Root\n")
             else:
-                lines.append(f"### {dir_path}/")
+                w(f"### {dir_path}/\n")
 
-            for f in by_dir[dir_path]:
-                lines.append(f"\n**{Path(f.path).name}** ({f.language})")
+            for file_name, f in by_dir[dir_path]:
+                w(f"\n**{file_name}** ({f.language})\n")
 
                 if f.imports:
-                    imports_short = f.imports[:5]
-                    lines.append(f"- Imports: {', '.join(imports_short)}")
+                    w(f"- Imports: {', '.join(f.imports[:5])}\n")
                     if len(f.imports) > 5:
-                        lines.append(f"  ...and {len(f.imports) - 5} more")
-
-                if f.classes:
-                    for cls in f.classes:
-                        bases = f"({', '.join(cls.bases)})" if cls.bases else ""
-                        lines.append(f"- Class `{cls.name}{bases}`")
-                        if cls.methods:
-                            methods_str = ", ".join(cls.methods[:5])
-                            lines.append(f"  - Methods: {methods_str}")
-
-                if f.functions:
-                    for func in f.functions[:10]:
-                        async_prefix = "async " if func.is_async else ""
-                        args_str = ", ".join(func.args[:3])
-                        if len(func.args) > 3:
-                            args_str += ", ..."
-                        ret = f" -> {func.returns}" if func.returns else ""
-                        lines.append(f"- `{async_prefix}{func.name}({args_str}){ret}`")
-                    if len(f.functions) > 10:
-                        lines.append(f"  ...and {len(f.functions) - 10} more functions")
-
-            lines.append("")
-
-        return "\n".join(lines)
-
-
-def _analyze_python_file(path: Path, content: str) -> FileInfo:
-    """Analyze Python file and extract structure."""
+                        w(f"  ...and {len(f.imports) - 5} more\n")
+
+                for cls in f.classes:
+                    bases = f"({', '.join(cls.bases)})" if cls.bases else ""
+                    w(f"- Class `{cls.name}{bases}`\n")
+                    if cls.methods:
+                        w(f"  - Methods: {', '.join(cls.methods[:5])}\n")
+
+                for func in f.functions[:10]:
+                    async_prefix = "async " if func.is_async else ""
+                    args_str = ", ".join(func.args[:3])
+                    if len(func.args) > 3:
+                        args_str += ", ..."
+                    ret = f" -> {func.returns}" if func.returns else ""
+                    w(f"- `{async_prefix}{func.name}({args_str}){ret}`\n")
+                if len(f.functions) > 10:
+                    w(f"  ...and {len(f.functions) - 10} more functions\n")
+
+            w("\n")
+
+        return buf.getvalue()
+
+
+def _fast_unparse(node: ast.expr) -> str:
+    """Render an annotation/decorator expression, skipping ast.unparse for simple names.
+
+    Plain names, dotted attributes and string/None constants cover most annotations;
+    anything else falls back to ast.unparse ("?" if that fails).
+    """
+    if isinstance(node, ast.Name):
+        return node.id
+    if isinstance(node, ast.Attribute) and isinstance(node.value, (ast.Name, ast.Attribute)):
+        return f"{_fast_unparse(node.value)}.{node.attr}"
+    if isinstance(node, ast.Constant) and (node.value is None or isinstance(node.value, str)):
+        return repr(node.value)
+    try:
+        return ast.unparse(node)
+    except Exception:
+        return "?"
+
+
+class _PythonStructureVisitor(ast.NodeVisitor):
+    """Collect module-level imports, classes and functions into a FileInfo.
+
+    Class and function bodies are not descended into (methods are listed on the
+    class), and only statement nodes are visited, so expression trees are skipped.
+    Statements nested in module-level if/try/with/match blocks are still seen.
+    """
+
+    def __init__(self, info: FileInfo) -> None:
+        self.info = info
+
+    def generic_visit(self, node: ast.AST) -> None:
+        for child in ast.iter_child_nodes(node):
+            if isinstance(child, (ast.stmt, ast.excepthandler, ast.match_case)):
+                self.visit(child)
+
+    def visit_Import(self, node: ast.Import) -> None:
+        for alias in node.names:
+            self.info.imports.append(sys.intern(alias.name))
+
+    def visit_ImportFrom(self, node: ast.ImportFrom) -> None:
+        module = node.module or ""
+        for alias in node.names:
+            self.info.imports.append(sys.intern(f"{module}.{alias.name}"))
+
+    def visit_ClassDef(self, node: ast.ClassDef) -> None:
+        bases = [sys.intern(getattr(b, "id", getattr(b, "attr", "?"))) for b in node.bases]
+        methods = [n.name for n in node.body if isinstance(n, (ast.FunctionDef, ast.AsyncFunctionDef))]
+        docstring = ast.get_docstring(node)
+        self.info.classes.append(
+            ClassInfo(
+                name=node.name,
+                bases=bases,
+                docstring=docstring[:100] if docstring else None,
+                methods=methods,
+            )
+        )
+
+    def visit_FunctionDef(self, node: ast.FunctionDef | ast.AsyncFunctionDef) -> None:
+        args = [f"{arg.arg}: {_fast_unparse(arg.annotation)}" if arg.annotation else arg.arg for arg in node.args.args]
+        returns = sys.intern(_fast_unparse(node.returns)) if node.returns else None
+        decorators = [sys.intern(_fast_unparse(dec)) for dec in node.decorator_list]
+
+        self.info.functions.append(
+            FunctionInfo(
+                name=node.name,
+                args=args,
+                returns=returns,
+                docstring=ast.get_docstring(node),
+                is_async=isinstance(node, ast.AsyncFunctionDef),
+                decorators=decorators,
+            )
+        )
+
+    def visit_AsyncFunctionDef(self, node: ast.AsyncFunctionDef) -> None:
+        self.visit_FunctionDef(node)
+
+
+def _analyze_python_file(content: str) -> FileInfo:
+    """Analyze Python file and extract structure (path is filled in by analyze_file).
+
+    Import, base class, annotation and decorator strings repeat heavily across
+    files, so they are interned to share one object per distinct value.
+    """
     info = FileInfo(
-        path=str(path),
+        path="",
         language="python",
     )
 
@@ -134,171 +330,135 @@ def _analyze_python_file(path: Path, content: str) -> FileInfo:
         info.summary = "Failed to parse"
         return info
 
-    for node in ast.walk(tree):
-        # Imports
-        if isinstance(node, ast.Import):
-            for alias in node.names:
-                info.imports.append(alias.name)
-        elif isinstance(node, ast.ImportFrom):
-            module = node.module or ""
-            for alias in node.names:
-                info.imports.append(f"{module}.{alias.name}")
-
-        # Classes (top-level only)
-        elif isinstance(node, ast.ClassDef):
-            bases = [getattr(b, "id", getattr(b, "attr", "?")) for b in node.bases]
-            methods = [n.name for n in node.body if isinstance(n, (ast.FunctionDef, ast.AsyncFunctionDef))]
-            docstring = ast.get_docstring(node)
-            info.classes.append(
-                ClassInfo(
-                    name=node.name,
-                    bases=bases,
-                    docstring=docstring[:100] if docstring else None,
-                    methods=methods,
-                )
-            )
-
-        # Functions (top-level only)
-        elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
-            # Skip if inside a class
-            if any(isinstance(p, ast.ClassDef) for p in ast.walk(tree)):
-                # This is a rough check, could be improved
-                pass
-
-            args = []
-            for arg in node.args.args:
-                arg_name = arg.arg
-                if arg.annotation:
-                    try:
-                        arg_name += f": {ast.unparse(arg.annotation)}"
-                    except Exception:
-                        pass
-                args.append(arg_name)
-
-            returns = None
-            if node.returns:
-                try:
-                    returns = ast.unparse(node.returns)
-                except Exception:
-                    returns = "?"
-
-            decorators = []
-            for dec in node.decorator_list:
-                try:
-                    decorators.append(ast.unparse(dec))
-                except Exception:
-                    decorators.append("?")
-
-            info.functions.append(
-                FunctionInfo(
-                    name=node.name,
-                    args=args,
-                    returns=returns,
-                    docstring=ast.get_docstring(node),
-                    is_async=isinstance(node, ast.AsyncFunctionDef),
-                    decorators=decorators,
-                )
-            )
+    _PythonStructureVisitor(info).visit(tree)
 
     return info
 
 
-def _analyze_typescript_file(path: Path, content: str) -> FileInfo:
-    """Analyze TypeScript/JavaScript file (basic parsing)."""
+def _analyze_typescript_file(content: str, language: str) -> FileInfo:
+    """Analyze TypeScript/JavaScript file (basic parsing; path is filled in by analyze_file).
+
+    A single compiled regex is matched over the whole content, so declarations
+    are found in source order without splitting into lines.
+    """
     info = FileInfo(
-        path=str(path),
-        language="typescript" if path.suffix in (".ts", ".tsx") else "javascript",
+        path="",
+        language=language,
     )
 
-    lines = content.split("\n")
-
-    for line in lines:
-        line = line.strip()
-
-        # Imports
-        if line.startswith("import "):
-            # Extract module name from import statement
-            if " from " in line:
-                parts = line.split(" from ")
-                if len(parts) > 1:
-                    module = parts[1].strip().strip("';\"")
-                    info.imports.append(module)
-
-        # Exports
-        if line.startswith("export "):
-            if "function " in line:
-                # export function name
-                match = line.split("function ")[1].split("(")[0].strip()
-                info.exports.append(f"function {match}")
+    class_names: set[str] = set()
+    function_names: set[str] = set()
+
+    for m in _TS_DECLARATION_RE.finditer(content):
+        exported = m.group("export") is not None
+
+        if m.group("import"):
+            # Module specifiers repeat across files; intern them like the Python analyzer
+            info.imports.append(sys.intern(m.group("import")))
+        elif m.group("function"):
+            name = m.group("function")
+            if exported:
+                info.exports.append(f"function {name}")
+            if name not in function_names:
+                function_names.add(name)
                 info.functions.append(
                     FunctionInfo(
-                        name=match,
+                        name=name,
                         args=[],
-                        is_async="async " in line,
+                        is_async=m.group("async") is not None,
                     )
                 )
-            elif "class " in line:
-                match = line.split("class ")[1].split(" ")[0].split("{")[0].strip()
-                info.exports.append(f"class {match}")
-                info.classes.append(ClassInfo(name=match, bases=[]))
-            elif "const " in line or "let " in line:
-                keyword = "const " if "const " in line else "let "
-                match = line.split(keyword)[1].split("=")[0].split(":")[0].strip()
-                info.exports.append(match)
-
-        # Class definitions
-        elif line.startswith("class ") or " class " in line:
-            parts = line.split("class ")[1] if "class " in line else ""
-            name = parts.split(" ")[0].split("{")[0].split("(")[0].strip()
-            if name and not any(c.name == name for c in info.classes):
-                bases = []
-                if "extends " in line:
-                    base = line.split("extends ")[1].split(" ")[0].split("{")[0].strip()
-                    bases.append(base)
+        elif m.group("class"):
+            name = m.group("class")
+            if exported:
+                info.exports.append(f"class {name}")
+            if name not in class_names:
+                class_names.add(name)
+                bases = [sys.intern(m.group("base"))] if m.group("base") else []
                 info.classes.append(ClassInfo(name=name, bases=bases))
-
-        # Function definitions
-        elif "function " in line:
-            if "function " in line:
-                parts = line.split("function ")[1]
-                name = parts.split("(")[0].strip()
-                if name and not any(f.name == name for f in info.functions):
-                    info.functions.append(
-                        FunctionInfo(
-                            name=name,
-                            args=[],
-                            is_async="async " in line,
-                        )
-                    )
+        elif m.group("variable"):
+            info.exports.append(m.group("variable"))
 
     return info
 
 
-def analyze_file(path: Path, content: str) -> FileInfo | None:
-    """Analyze a code file and return structure info."""
-    suffix = path.suffix.lower()
+@lru_cache(maxsize=1024)
+def _analyze_content(suffix: str, content: str) -> FileInfo:
+    """Analyze content by file suffix, memoized per process.
+
+    Identical files (copied __init__.py, vendored or generated code, re-indexing)
+    are parsed once. The cached FileInfo is shared: callers must not mutate it.
+    maxsize bounds how much source text the cache keeps alive.
+    """
+    lower = suffix.lower()
 
-    if suffix == ".py":
-        return _analyze_python_file(path, content)
-    elif suffix in (".ts", ".tsx", ".js", ".jsx"):
-        return _analyze_typescript_file(path, content)
+    if lower == ".py":
+        return _analyze_python_file(content)
+    elif lower in (".ts", ".tsx", ".js", ".jsx"):
+        return _analyze_typescript_file(content, "typescript" if suffix in (".ts", ".tsx") else "javascript")
     else:
         # Basic info for other files
         return FileInfo(
-            path=str(path),
-            language=suffix.lstrip(".") or "unknown",
+            path="",
+            language=lower.lstrip(".") or "unknown",
         )
 
 
+def analyze_file(path: Path, content: str) -> FileInfo | None:
+    """Analyze a code file and return structure info.
+
+    Nested lists may be shared with other results for identical content; treat as read-only.
+    """
+    return replace(_analyze_content(path.suffix, content), path=str(path))
+
+
+def _content_hash(content: str) -> str:
+    """Generate hash for file content."""
+    return hashlib.blake2b(content.encode(), digest_size=8).hexdigest()
+
+
+def _load_analysis_cache(cache_dir: str) -> dict[str, dict[str, dict]]:
+    """Load per-file analysis cache: {root: {rel_path: {"hash": ..., "info": FileInfo dict}}}.
+
+    A file written with another ANALYSIS_CACHE_VERSION (or in the old unversioned format) is ignored.
+    """
+    cache_path = Path(cache_dir) / ANALYSIS_CACHE_FILENAME
+    if not cache_path.exists():
+        return {}
+    try:
+        data = _json_loads(cache_path.read_bytes())
+    except Exception:
+        logger.debug("Failed to load analysis cache from %s", cache_path, exc_info=True)
+        return {}
+    if not isinstance(data, dict) or data.get("version") != ANALYSIS_CACHE_VERSION:
+        return {}
+    roots = data.get("roots")
+    return roots if isinstance(roots, dict) else {}
+
+
+def _save_analysis_cache(cache_dir: str, roots: dict[str, dict[str, dict]]) -> None:
+    """Persist per-file analysis cache for all cached roots."""
+    cache_path = Path(cache_dir) / ANALYSIS_CACHE_FILENAME
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        _json_dump_file({"version": ANALYSIS_CACHE_VERSION, "roots": roots}, cache_path)
+    except OSError:
+        logger.debug("Failed to save analysis cache to %s", cache_path, exc_info=True)
+
+
 def build_project_map(
     root_path: Path,
     files: list[tuple[str, str]],
+    cache_dir: str | None = None,
 ) -> ProjectMap:
     """Build project map from collected files.
 
     Args:
         root_path: Root path of the project
         files: List of (relative_path, content) tuples
+        cache_dir: If set, reuse per-file analyses from the cache in this directory
+            for files whose content hash is unchanged, and write the updated cache back.
+            Entries are kept per root, so building another project does not evict this one.
 
     Returns:
         ProjectMap with structure information
@@ -309,9 +469,27 @@ def build_project_map(
     total_classes = 0
     total_functions = 0
 
+    root_key = str(root_path)
+    cached_roots = _load_analysis_cache(cache_dir) if cache_dir else {}
+    old_cache = cached_roots.pop(root_key, None) or {}
+    new_cache: dict[str, dict] = {}
+
     for rel_path, content in files:
-        file_path = Path(rel_path)
-        file_info = analyze_file(file_path, content)
+        file_info = None
+        if cache_dir:
+            content_hash = _content_hash(content)
+            entry = old_cache.get(rel_path)
+            if entry and entry.get("hash") == content_hash:
+                try:
+                    file_info = FileInfo.from_dict(entry["info"])
+                except (KeyError, TypeError):
+                    file_info = None
+            if file_info is None:
+                file_info = analyze_file(Path(rel_path), content)
+            if file_info:
+                new_cache[rel_path] = {"hash": content_hash, "info": file_info}
+        else:
+            file_info = analyze_file(Path(rel_path), content)
 
         if file_info:
             project_map.files.append(file_info)
@@ -324,9 +502,28 @@ def build_project_map(
         "total_functions": total_functions,
     }
 
+    if cache_dir:
+        # This root goes last (most recent); the oldest roots beyond the limit are dropped
+        cached_roots[root_key] = new_cache
+        while len(cached_roots) > MAX_CACHED_ROOTS:
+            del cached_roots[next(iter(cached_roots))]
+        _save_analysis_cache(cache_dir, cached_roots)
+
     return project_map
 
 
+async def build_project_map_async(
+    root_path: Path,
+    files: list[tuple[str, str]],
+    cache_dir: str | None = None,
+) -> ProjectMap:
+    """Build project map in a worker thread so async callers don't block the event loop.
+
+    Same arguments and result as build_project_map.
+    """
+    return await asyncio.to_thread(build_project_map, root_path, files, cache_dir)
+
+
 def save_project_map(project_map: ProjectMap, output_dir: str = "output") -> Path:
     """Save project map to files."""
     output_path = Path(output_dir)
@@ -334,7 +531,7 @@ def save_project_map(project_map: ProjectMap, output_dir: str = "output") -> Pat
 
     # Save JSON
     json_path = output_path / "project_map.json"
-    json_path.write_text(project_map.to_json())
+    _json_dump_file(project_map, json_path, indent=True)
 
     # Save Markdown
     md_path = output_path / "project_map.md"
@@ -350,24 +547,10 @@ def load_project_map(output_dir: str = "output") -> ProjectMap | None:
         return None
 
     try:
-        data = json.loads(json_path.read_text())
+        data = _json_loads(json_path.read_bytes())
 
         # Reconstruct dataclasses
-        files = []
-        for f_data in data.get("files", []):
-            classes = [ClassInfo(**c) for c in f_data.get("classes", [])]
-            functions = [FunctionInfo(**fn) for fn in f_data.get("functions", [])]
-            files.append(
-                FileInfo(
-                    path=f_data["path"],
-                    language=f_data["language"],
-                    imports=f_data.get("imports", []),
-                    classes=classes,
-                    functions=functions,
-                    exports=f_data.get("exports", []),
-                    summary=f_data.get("summary", ""),
-                )
-            )
+        files = [FileInfo.from_dict(f_data) for f_data in data.get("files", [])]
 
         return ProjectMap(
             root_path=data["root_path"],
@@ -1,6 +1,7 @@
 """Researcher agent - RAG search for relevant code context."""
 
 import logging
+from collections import defaultdict
 
 from src.domain.entities.workflow_state import WorkflowState
 from src.domain.ports.rag import RAGPort
@@ -13,6 +14,18 @@ DEFAULT_MAX_TOKENS = 6000  # ~24KB of context, safe for most models
 DEFAULT_MIN_SCORE = 0.35
 
 
+def _project_map_overview(rag: RAGPort) -> str:
+    """Return project map markdown (size-limited) if the RAG adapter provides one."""
+    if not hasattr(rag, "get_project_map_markdown"):
+        return ""
+    try:
+        map_md = rag.get_project_map_markdown()
+        return map_md[:3000] if map_md else ""  # Limit size
+    except Exception:
+        logger.debug("Failed to get project map for researcher", exc_info=True)
+        return ""
+
+
 async def researcher_node(
     state: WorkflowState,
     rag: RAGPort | None,
@@ -49,31 +62,17 @@ async def researcher_node(
         )
 
         if not chunks:
-            project_map = ""
-            if hasattr(rag, "get_project_map_markdown"):
-                try:
-                    map_md = rag.get_project_map_markdown()
-                    if map_md:
-                        project_map = map_md[:3000]
-                except Exception:
-                    logger.debug("Failed to get project map for researcher", exc_info=True)
-            return {**state, "context": "", "project_map": project_map, "current_step": "researcher"}
+            return {**state, "context": "", "project_map": _project_map_overview(rag), "current_step": "researcher"}
 
         # Group chunks by source file for better context
-        files_context: dict[str, list[str]] = {}
+        files_context: defaultdict[str, list[str]] = defaultdict(list)
         for c in chunks:
-            source = c.metadata.get("source", "unknown")
-            if source not in files_context:
-                files_context[source] = []
-            files_context[source].append(c.content)
+            files_context[c.metadata.get("source", "unknown")].append(c.content)
 
         # Format context with file headers
-        context_parts = []
-        for source, contents in files_context.items():
-            file_content = "\n\n".join(contents)
-            context_parts.append(f"# File: {source}\n\n{file_content}")
-
-        context = "\n\n---\n\n".join(context_parts)
+        context = "\n\n---\n\n".join(
+            f"# File: {source}\n\n" + "\n\n".join(contents) for source, contents in files_context.items()
+        )
 
         # Add summary of what was found
         summary = f"[RAG: {len(chunks)} chunks from {len(files_context)} files]"
@@ -83,13 +82,4 @@ async def researcher_node(
         context = f"[RAG error: {e}]"
 
     # B2: Project map (structure overview)
-    project_map = ""
-    if rag and hasattr(rag, "get_project_map_markdown"):
-        try:
-            map_md = rag.get_project_map_markdown()
-            if map_md:
-                project_map = map_md[:3000]  # Limit size
-        except Exception:
-            logger.debug("Failed to get project map for researcher", exc_info=True)
-
-    return {**state, "context": context, "project_map": project_map, "current_step": "researcher"}
+    return {**state, "context": context, "project_map": _project_map_overview(rag), "current_step": "researcher"}
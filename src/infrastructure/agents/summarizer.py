@@ -1,7 +1,9 @@
 """Summarizer agent - LLM-based context summarization."""
 
+import asyncio
 import hashlib
 import logging
+import sqlite3
 import threading
 from pathlib import Path
 
@@ -9,41 +11,75 @@ from src.domain.ports.llm import LLMMessage, LLMPort
 
 logger = logging.getLogger(__name__)
 
-# Cache for summaries (in-memory, persisted to file); lock for thread safety
+# Persistent summary cache (SQLite, one row per content hash) fronted by an in-process
+# dict of entries seen so far; lock for thread safety
 _summary_cache: dict[str, str] = {}
 _cache_lock = threading.Lock()
-_cache_file = Path("output/summary_cache.json")
+_cache_file = Path("output/summary_cache.db")
+_cache_conn: sqlite3.Connection | None = None
+# Pre-SQLite cache file; its sha256-based keys never match current hashes, so it is removed
+_legacy_cache_file = Path("output/summary_cache.json")
 
 
-def _load_cache() -> None:
-    """Load summary cache from file. Caller must hold _cache_lock when modifying cache."""
-    global _summary_cache
-    if _cache_file.exists():
+def _get_cache_conn() -> sqlite3.Connection | None:
+    """Open the cache database on first use. Caller must hold _cache_lock."""
+    global _cache_conn
+    if _cache_conn is None:
         try:
-            import json
-
-            _summary_cache = json.loads(_cache_file.read_text())
-        except Exception:
-            logger.debug("Failed to load summary cache from %s", _cache_file, exc_info=True)
-            _summary_cache = {}
-    else:
-        _summary_cache = {}
-
-
-def _save_cache() -> None:
-    """Save summary cache to file. Caller must hold _cache_lock."""
-    try:
-        import json
-
-        _cache_file.parent.mkdir(parents=True, exist_ok=True)
-        _cache_file.write_text(json.dumps(_summary_cache))
-    except Exception:
-        logger.debug("Failed to save summary cache to %s", _cache_file, exc_info=True)
+            _cache_file.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(_cache_file), check_same_thread=False)
+            conn.execute("CREATE TABLE IF NOT EXISTS summaries (hash TEXT PRIMARY KEY, summary TEXT NOT NULL)")
+            conn.commit()
+            _cache_conn = conn
+        except sqlite3.Error:
+            logger.debug("Failed to open summary cache %s", _cache_file, exc_info=True)
+            return None
+        try:
+            _legacy_cache_file.unlink(missing_ok=True)
+        except OSError:
+            logger.debug("Failed to remove legacy summary cache %s", _legacy_cache_file, exc_info=True)
+    return _cache_conn
+
+
+def _cache_get(content_hash: str) -> str | None:
+    """Return cached summary for content hash, if any (database is queried once per hash)."""
+    with _cache_lock:
+        if content_hash in _summary_cache:
+            return _summary_cache[content_hash]
+        conn = _get_cache_conn()
+        if conn is None:
+            return None
+        try:
+            row = conn.execute("SELECT summary FROM summaries WHERE hash = ?", (content_hash,)).fetchone()
+        except sqlite3.Error:
+            logger.debug("Failed to read summary cache", exc_info=True)
+            return None
+        if row is None:
+            return None
+        _summary_cache[content_hash] = row[0]
+        return row[0]
+
+
+def _cache_put(content_hash: str, summary: str) -> None:
+    """Store a single summary in the cache."""
+    with _cache_lock:
+        _summary_cache[content_hash] = summary
+        conn = _get_cache_conn()
+        if conn is None:
+            return
+        try:
+            conn.execute(
+                "INSERT OR REPLACE INTO summaries (hash, summary) VALUES (?, ?)",
+                (content_hash, summary),
+            )
+            conn.commit()
+        except sqlite3.Error:
+            logger.debug("Failed to write summary cache", exc_info=True)
 
 
 def _content_hash(content: str) -> str:
     """Generate hash for content."""
-    return hashlib.sha256(content.encode()).hexdigest()[:16]
+    return hashlib.blake2b(content.encode(), digest_size=8).hexdigest()
 
 
 SUMMARIZE_SYSTEM = """You are a code summarizer. Your task is to create concise summaries of code files and context that preserve the most important information for a developer.
@@ -103,10 +139,9 @@ async def summarize_content(
     # Check cache
     content_hash = _content_hash(content)
     if use_cache:
-        with _cache_lock:
-            _load_cache()
-            if content_hash in _summary_cache:
-                return _summary_cache[content_hash]
+        cached = _cache_get(content_hash)
+        if cached is not None:
+            return cached
 
     # Generate summary
     messages = [
@@ -125,9 +160,7 @@ async def summarize_content(
 
         # Cache result
         if use_cache and summary:
-            with _cache_lock:
-                _summary_cache[content_hash] = summary
-                _save_cache()
+            _cache_put(content_hash, summary)
 
         return summary
     except Exception as e:
@@ -164,21 +197,21 @@ async def summarize_chunks(
             by_file[source] = []
         by_file[source].append(content)
 
-    # Summarize each file
-    file_summaries = []
+    # Summarize files concurrently (independent LLM calls; errors are handled per call)
     tokens_per_file = max_total_tokens // len(by_file) if by_file else max_total_tokens
-
-    for source, contents in by_file.items():
-        full_content = f"# {source}\n\n" + "\n\n".join(contents)
-        summary = await summarize_content(
-            full_content,
-            llm,
-            model,
-            max_output_tokens=tokens_per_file,
+    summaries = await asyncio.gather(
+        *(
+            summarize_content(
+                f"# {source}\n\n" + "\n\n".join(contents),
+                llm,
+                model,
+                max_output_tokens=tokens_per_file,
+            )
+            for source, contents in by_file.items()
         )
-        file_summaries.append(f"## {source}\n{summary}")
+    )
 
-    return "\n\n---\n\n".join(file_summaries)
+    return "\n\n---\n\n".join(f"## {source}\n{summary}" for source, summary in zip(by_file, summaries, strict=True))
 
 
 async def summarize_conversation(
@@ -1,33 +1,132 @@
-"""Validator agent - runs tests via subprocess with timeout."""
+"""Validator agent - runs tests in a child process with timeout."""
 
 import asyncio
+import functools
+import importlib.util
+import multiprocessing
+import multiprocessing.context
+import os
+import subprocess
+import sys
 import tempfile
+from importlib.metadata import entry_points
 from pathlib import Path
 
 from src.domain.entities.workflow_state import WorkflowState
 
+VALIDATION_TIMEOUT = 30  # seconds
+_OUTPUT_FILENAME = ".validator_output"
+_warm_context: multiprocessing.context.BaseContext | None = None
+_warm_context_checked = False
 
-def _run_pytest_sync(tmpdir: str, code: str, tests: str) -> tuple[bool, str]:
-    """Run pytest in subprocess. Returns (passed, output)."""
-    import subprocess
 
-    path = Path(tmpdir)
-    (path / "impl.py").write_text(code, encoding="utf-8")
-    test_content = tests
-    if "from impl" not in test_content and "import impl" not in test_content:
-        test_content = "import sys\nsys.path.insert(0, '.')\n" + test_content
-    (path / "test_impl.py").write_text(test_content, encoding="utf-8")
+@functools.cache
+def _installed_pytest_plugins() -> tuple[str, ...]:
+    """Modules of installed pytest plugins (pytest11 entry points), looked up once per process.
+
+    Autoloading would scan entry points again in every run; enabling the same
+    plugins with -p keeps fixtures such as mocker or anyio_backend available.
+    Entry points that name an attribute (module:attr) cannot be passed to -p and are skipped.
+    """
+    return tuple(sorted({ep.value for ep in entry_points(group="pytest11") if ":" not in ep.value}))
+
+
+def _pytest_args() -> list[str]:
+    """Build pytest arguments.
+
+    Plugin autoloading is disabled (see _run_pytest_sync), so installed plugins
+    are enabled explicitly.
+    """
+    args = ["test_impl.py", "-v", "--tb=short", "-p", "no:cacheprovider"]
+    for plugin in _installed_pytest_plugins():
+        args += ["-p", plugin]
+    return args
+
+
+def _get_warm_context() -> multiprocessing.context.BaseContext | None:
+    """Return a forkserver context whose server has pytest preloaded, or None if unsupported.
+
+    Each validation still runs in its own short-lived child (fresh module state,
+    killable on timeout), but it is forked from an interpreter that already
+    imported pytest and its plugins, so neither interpreter startup nor those imports are paid again.
+    """
+    global _warm_context, _warm_context_checked
+    if not _warm_context_checked:
+        _warm_context_checked = True
+        if "forkserver" in multiprocessing.get_all_start_methods() and importlib.util.find_spec("pytest"):
+            ctx = multiprocessing.get_context("forkserver")
+            ctx.set_forkserver_preload(["__main__", __name__, "pytest", *_installed_pytest_plugins()])
+            _warm_context = ctx
+    return _warm_context
+
+
+def _pytest_worker(tmpdir: str, args: list[str]) -> None:
+    """Forked child: run pytest in-process, writing all output to a file in tmpdir."""
+    import pytest
+
+    os.chdir(tmpdir)
+    os.environ["PYTEST_DISABLE_PLUGIN_AUTOLOAD"] = "1"
+    fd = os.open(_OUTPUT_FILENAME, os.O_WRONLY | os.O_CREAT | os.O_TRUNC)
+    os.dup2(fd, 1)
+    os.dup2(fd, 2)
+    try:
+        code = int(pytest.main(args))
+    finally:
+        sys.stdout.flush()
+        sys.stderr.flush()
+    os._exit(code)
+
+
+def _run_in_warm_worker(ctx: multiprocessing.context.BaseContext, tmpdir: str) -> tuple[bool, str]:
+    """Run pytest in a child forked from the warm forkserver."""
+    # Not daemonic: generated tests may start their own processes; join+kill bounds the lifetime
+    proc = ctx.Process(target=_pytest_worker, args=(tmpdir, _pytest_args()))
+    proc.start()
+    proc.join(VALIDATION_TIMEOUT)
+    if proc.is_alive():
+        proc.kill()
+        proc.join()
+        return False, f"Validation timeout ({VALIDATION_TIMEOUT}s)"
+    output_file = Path(tmpdir) / _OUTPUT_FILENAME
+    output = output_file.read_text(encoding="utf-8", errors="replace") if output_file.exists() else ""
+    return proc.exitcode == 0, output
+
+
+def _run_in_subprocess(tmpdir: str) -> tuple[bool, str]:
+    """Run pytest in a fresh interpreter (fallback when forkserver is unavailable)."""
     try:
         result = subprocess.run(
-            ["python", "-m", "pytest", "test_impl.py", "-v", "--tb=short"],
+            [sys.executable, "-m", "pytest", *_pytest_args()],
             cwd=tmpdir,
             capture_output=True,
             text=True,
-            timeout=30,
+            timeout=VALIDATION_TIMEOUT,
+            env={**os.environ, "PYTEST_DISABLE_PLUGIN_AUTOLOAD": "1"},
         )
         return result.returncode == 0, result.stdout + result.stderr
     except subprocess.TimeoutExpired:
-        return False, "Validation timeout (30s)"
+        return False, f"Validation timeout ({VALIDATION_TIMEOUT}s)"
+
+
+def _run_pytest_sync(tmpdir: str, code: str, tests: str) -> tuple[bool, str]:
+    """Run pytest in a child process. Returns (passed, output).
+
+    Generated code stays isolated in a child process (killable on timeout).
+    Startup is dominated by entry-point plugin discovery, so autoloading is
+    turned off and the installed plugins are passed with -p (discovered once);
+    the cache provider is skipped since tmpdir is discarded.
+    """
+    path = Path(tmpdir)
+    (path / "impl.py").write_text(code, encoding="utf-8")
+    test_content = tests
+    if "from impl" not in test_content and "import impl" not in test_content:
+        test_content = "import sys\nsys.path.insert(0, '.')\n" + test_content
+    (path / "test_impl.py").write_text(test_content, encoding="utf-8")
+    try:
+        ctx = _get_warm_context()
+        if ctx is not None:
+            return _run_in_warm_worker(ctx, tmpdir)
+        return _run_in_subprocess(tmpdir)
     except Exception as e:
         return False, str(e)
 
@@ -11,6 +11,7 @@ from src.infrastructure.analyzer.models import (
     ProjectAnalysis,
     SecurityIssue,
 )
+from src.infrastructure.analyzer.parsed_file import ParsedFileCache
 from src.infrastructure.analyzer.project_analyzer import ProjectAnalyzer
 from src.infrastructure.analyzer.report_generator import ReportGenerator
 
@@ -20,6 +21,7 @@ __all__ = [
     "FileMetrics",
     "SecurityIssue",
     "ArchitectureInfo",
+    "ParsedFileCache",
     "ReportGenerator",
     "DependencyGraphResult",
     "build_dependency_graph",
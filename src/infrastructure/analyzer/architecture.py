@@ -4,73 +4,73 @@ Builds ArchitectureInfo (layers, dependencies, entry points, config files)
 from project path and file list. Used by ProjectAnalyzer.
 """
 
-import ast
 from pathlib import Path
 
 from src.infrastructure.analyzer.file_metrics import extract_imports
 from src.infrastructure.analyzer.models import ArchitectureInfo
+from src.infrastructure.analyzer.parsed_file import ParsedFileCache
 
 ENTRY_PATTERNS = ["main.py", "app.py", "run.py", "index.py", "__main__.py", "cli.py"]
 CONFIG_PATTERNS = ["*.toml", "*.yaml", "*.yml", "*.json", "*.ini", "*.env*"]
 STDLIB_PREFIXES = ("os", "sys", "re", "json", "typing", "dataclass")
 
+# CONFIG_PATTERNS/ENTRY_PATTERNS в виде, проверяемом без glob: "*.toml" == endswith(".toml"),
+# "*.env*" == ".env" в имени (Path.match компилировал бы шаблон на каждый файл)
+_ENTRY_NAMES = frozenset(ENTRY_PATTERNS)
+_CONFIG_SUFFIXES = tuple(p[1:] for p in CONFIG_PATTERNS if p.startswith("*.") and "*" not in p[1:])
+_CONFIG_ENV_MARKER = ".env"
 
-def analyze_architecture(path: Path, files: list[Path]) -> ArchitectureInfo:
+
+def analyze_architecture(
+    path: Path,
+    files: list[Path],
+    cache: ParsedFileCache | None = None,
+    imports: dict[Path, list[str]] | None = None,
+) -> ArchitectureInfo:
     """Анализирует архитектуру проекта.
 
     Args:
         path: Корень проекта.
         files: Список путей к файлам проекта.
+        cache: Общий кэш содержимого/AST на время анализа.
+        imports: Уже извлечённые импорты по файлам (FileMetrics.imports); для них AST не нужен.
 
     Returns:
         ArchitectureInfo с layers, dependencies, entry_points, config_files.
 
     """
     arch = ArchitectureInfo()
+    cache = cache or ParsedFileCache()
+    imports = imports or {}
 
+    # Один проход по файлам: слои, точки входа, конфиги, зависимости
     for file_path in files:
         try:
             rel = file_path.relative_to(path)
         except ValueError:
             continue
-        parts = rel.parts
-        if len(parts) > 1:
-            layer = parts[0]
-            if layer not in arch.layers:
-                arch.layers[layer] = []
-            arch.layers[layer].append(str(rel))
+        rel_path = str(rel)
+        name = file_path.name
 
-    for file_path in files:
-        if file_path.name in ENTRY_PATTERNS:
-            try:
-                arch.entry_points.append(str(file_path.relative_to(path)))
-            except ValueError:
-                pass
+        if len(rel.parts) > 1:
+            arch.layers.setdefault(rel.parts[0], []).append(rel_path)
 
-    for file_path in files:
-        for pattern in CONFIG_PATTERNS:
-            if file_path.match(pattern):
-                try:
-                    arch.config_files.append(str(file_path.relative_to(path)))
-                except ValueError:
-                    pass
-                break
+        if name in _ENTRY_NAMES:
+            arch.entry_points.append(rel_path)
+
+        if name.endswith(_CONFIG_SUFFIXES) or _CONFIG_ENV_MARKER in name:
+            arch.config_files.append(rel_path)
 
-    for file_path in files:
         if file_path.suffix != ".py":
             continue
-        try:
-            content = file_path.read_text(encoding="utf-8", errors="replace")
-            tree = ast.parse(content)
-            imports = extract_imports(tree)
-            try:
-                rel_path = str(file_path.relative_to(path))
-            except ValueError:
+        file_imports = imports.get(file_path)
+        if file_imports is None:
+            parsed = cache.get(file_path)
+            if parsed is None or parsed.tree is None:
                 continue
-            local_imports = [i for i in imports if not i.startswith(STDLIB_PREFIXES)]
-            if local_imports:
-                arch.dependencies[rel_path] = local_imports[:10]
-        except (SyntaxError, OSError):
-            continue
+            file_imports = extract_imports(parsed.tree)
+        local_imports = [i for i in file_imports if not i.startswith(STDLIB_PREFIXES)]
+        if local_imports:
+            arch.dependencies[rel_path] = local_imports[:10]
 
     return arch
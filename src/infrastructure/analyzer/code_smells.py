@@ -1,53 +1,128 @@
 """Code smells detection for project analyzer.
 
-Finds code smell patterns (long params, deep nesting, bare except, etc.)
-in Python files. Used by ProjectAnalyzer.
+Finds code smells (long params, deep nesting, bare except, etc.) in Python
+files from the parsed AST; only type: ignore comments are matched by regex.
+Used by ProjectAnalyzer.
 """
 
+import ast
 import re
 from pathlib import Path
 
-CODE_SMELL_PATTERNS: list[tuple[str, str]] = [
-    (r"def\s+\w+\([^)]{100,}\)", "Длинный список параметров (>5)"),
-    (r"if\s+.*:\s*\n\s+if\s+.*:\s*\n\s+if", "Глубокая вложенность (3+ уровня)"),
-    (r"except\s*:", "Пустой except"),
-    (r"from\s+\w+\s+import\s+\*", "Импорт через *"),
-    (r"global\s+\w+", "Использование global"),
-    (r"#.*type:\s*ignore", "Комментарий type: ignore"),
-]
+from src.infrastructure.analyzer.parsed_file import ParsedFileCache
 
-_COMPILED: list[tuple[re.Pattern[str], str]] = [
-    (re.compile(pattern, re.MULTILINE), desc) for pattern, desc in CODE_SMELL_PATTERNS
-]
+SMELL_LONG_PARAMS = "Длинный список параметров (>5)"
+SMELL_DEEP_NESTING = "Глубокая вложенность (3+ уровня)"
+SMELL_BARE_EXCEPT = "Пустой except"
+SMELL_STAR_IMPORT = "Импорт через *"
+SMELL_GLOBAL = "Использование global"
+SMELL_TYPE_IGNORE = "Комментарий type: ignore"
+
+# Порядок вывода smells для файла
+SMELL_ORDER = (
+    SMELL_LONG_PARAMS,
+    SMELL_DEEP_NESTING,
+    SMELL_BARE_EXCEPT,
+    SMELL_STAR_IMPORT,
+    SMELL_GLOBAL,
+    SMELL_TYPE_IGNORE,
+)
+
+MAX_PARAMS = 5
+MAX_NESTING = 3
+
+# Блоки, увеличивающие вложенность
+_NESTING_NODES = (ast.If, ast.For, ast.AsyncFor, ast.While, ast.Try, ast.TryStar, ast.With, ast.AsyncWith)
+# Новая область видимости: вложенность внутри считается заново
+_SCOPE_NODES = (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)
+# Поля со вложенными операторами; все искомые smells — операторы (или except-ветки),
+# поэтому выражения не обходятся
+_BLOCK_FIELDS = ("body", "orelse", "finalbody", "handlers", "cases")
+
+# Only comments are still matched by regex; everything structural comes from the AST,
+# which has no false positives from strings/comments and no backtracking on long lines.
+_TYPE_IGNORE_RE = re.compile(r"#.*type:\s*ignore")
 
 MAX_SMELLS = 20
 
 
-def find_code_smells(files: list[Path], base_path: Path) -> list[str]:
+def find_code_smells(files: list[Path], base_path: Path, cache: ParsedFileCache | None = None) -> list[str]:
     """Находит code smells в Python-файлах.
 
     Args:
         files: Список путей к файлам.
         base_path: Базовый путь проекта (для rel_path в результатах).
+        cache: Общий кэш содержимого/AST на время анализа.
 
     Returns:
         Список строк вида "rel_path: описание (N occurrences)", не более MAX_SMELLS.
 
     """
     smells: list[str] = []
+    cache = cache or ParsedFileCache()
     for file_path in files:
+        # Лимит набран — остальные файлы не читаются и не разбираются
+        if len(smells) >= MAX_SMELLS:
+            break
         if file_path.suffix != ".py":
             continue
-        try:
-            content = file_path.read_text(encoding="utf-8", errors="replace")
-        except OSError:
+        parsed = cache.get(file_path)
+        if parsed is None:
             continue
+        content = parsed.content
         try:
             rel_path = str(file_path.relative_to(base_path))
         except ValueError:
             continue
-        for compiled_pattern, description in _COMPILED:
-            matches = compiled_pattern.findall(content)
-            if matches:
-                smells.append(f"{rel_path}: {description} ({len(matches)} occurrences)")
+        counts = _count_tree_smells(parsed.tree) if parsed.tree is not None else {}
+        type_ignores = len(_TYPE_IGNORE_RE.findall(content)) if "type:" in content else 0
+        if type_ignores:
+            counts[SMELL_TYPE_IGNORE] = type_ignores
+        for description in SMELL_ORDER:
+            if counts.get(description):
+                smells.append(f"{rel_path}: {description} ({counts[description]} occurrences)")
     return smells[:MAX_SMELLS]
+
+
+def _count_tree_smells(tree: ast.AST) -> dict[str, int]:
+    """Считает структурные smells за один обход AST.
+
+    Вложенность: блок if/for/while/try/with на уровне MAX_NESTING считается один раз;
+    elif не углубляет вложенность, функции и классы начинают отсчёт заново.
+    """
+    counts = dict.fromkeys(SMELL_ORDER, 0)
+    stack: list[tuple[ast.AST, int]] = [(tree, 0)]
+    while stack:
+        node, depth = stack.pop()
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            args = node.args
+            if len(args.posonlyargs) + len(args.args) + len(args.kwonlyargs) > MAX_PARAMS:
+                counts[SMELL_LONG_PARAMS] += 1
+        elif isinstance(node, ast.ExceptHandler):
+            if node.type is None:
+                counts[SMELL_BARE_EXCEPT] += 1
+        elif isinstance(node, ast.ImportFrom):
+            if any(alias.name == "*" for alias in node.names):
+                counts[SMELL_STAR_IMPORT] += 1
+        elif isinstance(node, ast.Global):
+            counts[SMELL_GLOBAL] += 1
+
+        if isinstance(node, _SCOPE_NODES):
+            child_depth = 0
+        elif isinstance(node, _NESTING_NODES):
+            child_depth = depth + 1
+            if child_depth == MAX_NESTING:
+                counts[SMELL_DEEP_NESTING] += 1
+        else:
+            child_depth = depth
+
+        for field_name in _BLOCK_FIELDS:
+            block = getattr(node, field_name, None)
+            if not block:
+                continue
+            if field_name == "orelse" and isinstance(node, ast.If) and len(block) == 1 and isinstance(block[0], ast.If):
+                # elif: ветка на том же уровне, что и исходный if
+                stack.append((block[0], depth))
+            else:
+                stack.extend((child, child_depth) for child in block)
+    return counts
@@ -3,18 +3,47 @@
 Runs coverage in project directory and returns formatted report for LLM.
 """
 
+import importlib.util
 import subprocess
+import sys
+import tempfile
 from pathlib import Path
 
 COVERAGE_TIMEOUT = 90  # seconds for pytest
+COVERAGE_REPORT_TIMEOUT = 15  # seconds for coverage report
 COVERAGE_REPORT_MAX_CHARS = 4000  # limit for prompt
 
+# Runs pytest under coverage and writes the report in one interpreter (argv[1] = report file).
+# Kept out of the server process on purpose: project tests are untrusted, may hang or mutate
+# global state, and must stay killable by timeout.
+_COVERAGE_DRIVER = """
+import sys
+import coverage
+
+cov = coverage.Coverage()
+cov.start()
+import pytest
+
+code = pytest.main(["tests/", "-q", "--tb=no"])
+cov.stop()
+cov.save()
+with open(sys.argv[1], "w", encoding="utf-8") as report:
+    try:
+        cov.report(show_missing=True, file=report)
+    except Exception as e:
+        report.seek(0)
+        report.truncate()
+        report.write("ERROR: " + str(e))
+sys.exit(int(code))
+"""
+
 
 def collect_coverage_for_analysis(project_path: str) -> str:
     """Run pytest with coverage and return formatted report for analysis prompt.
 
     - If coverage is not installed or no Python tests: returns short message.
-    - Runs: coverage run -m pytest tests/ -q --tb=no; coverage report -m
+    - Runs pytest tests/ -q --tb=no under coverage and coverage report -m in one child
+      interpreter; falls back to the coverage CLI when coverage/pytest are not importable here.
     - Limits output size for prompt.
     """
     path = Path(project_path).resolve()
@@ -27,6 +56,51 @@ def collect_coverage_for_analysis(project_path: str) -> str:
     if not has_pyproject or not tests_dir.is_dir():
         return "Покрытие не измерено: не Python-проект или нет папки tests/."
 
+    if importlib.util.find_spec("coverage") is not None and importlib.util.find_spec("pytest") is not None:
+        return _collect_in_single_process(path)
+    return _collect_with_cli(path)
+
+
+def _format_report(out: str, pytest_code: int) -> str:
+    """Обрезает отчёт coverage для промпта и оформляет блоком кода."""
+    out = out.strip()
+    if not out:
+        return "Покрытие не измерено: пустой отчёт coverage."
+    if len(out) > COVERAGE_REPORT_MAX_CHARS:
+        out = out[:COVERAGE_REPORT_MAX_CHARS] + "\n... (обрезано)"
+    return f"```\n{out}\n```\n(Запуск: coverage run -m pytest tests/ -q; exit code pytest: {pytest_code})"
+
+
+def _collect_in_single_process(path: Path) -> str:
+    """Тесты и отчёт coverage в одном дочернем интерпретаторе (один запуск вместо двух)."""
+    with tempfile.TemporaryDirectory() as tmp:
+        report_file = Path(tmp) / "coverage_report.txt"
+        try:
+            run_result = subprocess.run(
+                [sys.executable, "-c", _COVERAGE_DRIVER, str(report_file)],
+                cwd=str(path),
+                capture_output=True,
+                text=True,
+                timeout=COVERAGE_TIMEOUT + COVERAGE_REPORT_TIMEOUT,
+            )
+            out = report_file.read_text(encoding="utf-8") if report_file.exists() else ""
+        except subprocess.TimeoutExpired:
+            return "Покрытие не измерено: запуск тестов превысил таймаут."
+        except Exception as e:
+            return f"Покрытие не измерено: {e!s}"
+
+    if not out:
+        detail = (run_result.stderr or run_result.stdout or "").strip()[-500:]
+        return f"Покрытие не измерено: {detail or 'ошибка запуска coverage'}"
+    if out.startswith("ERROR: "):
+        if "No data to report" in out:
+            return "Покрытие не измерено: тесты не запускались или не собрали данные (проверьте pytest)."
+        return f"Покрытие не измерено: {out.removeprefix('ERROR: ')}"
+    return _format_report(out, run_result.returncode)
+
+
+def _collect_with_cli(path: Path) -> str:
+    """Fallback: coverage из PATH (не установлен в окружении сервера) — два запуска CLI."""
     try:
         # Run coverage (creates .coverage in project_path)
         run_result = subprocess.run(
@@ -42,7 +116,7 @@ def collect_coverage_for_analysis(project_path: str) -> str:
             cwd=str(path),
             capture_output=True,
             text=True,
-            timeout=15,
+            timeout=COVERAGE_REPORT_TIMEOUT,
         )
         if report_result.returncode != 0:
             if "No module named 'coverage'" in (report_result.stderr or "") or "coverage: command not found" in (
@@ -53,14 +127,7 @@ def collect_coverage_for_analysis(project_path: str) -> str:
                 return "Покрытие не измерено: тесты не запускались или не собрали данные (проверьте pytest)."
             return f"Покрытие не измерено: {report_result.stderr or report_result.stdout or 'ошибка coverage report'}"
 
-        out = (report_result.stdout or "").strip()
-        if not out:
-            return "Покрытие не измерено: пустой отчёт coverage."
-
-        # Truncate for prompt
-        if len(out) > COVERAGE_REPORT_MAX_CHARS:
-            out = out[:COVERAGE_REPORT_MAX_CHARS] + "\n... (обрезано)"
-        return f"```\n{out}\n```\n(Запуск: coverage run -m pytest tests/ -q; exit code pytest: {run_result.returncode})"
+        return _format_report(report_result.stdout or "", run_result.returncode)
     except subprocess.TimeoutExpired:
         return "Покрытие не измерено: запуск тестов превысил таймаут."
     except FileNotFoundError:
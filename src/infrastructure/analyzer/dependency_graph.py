@@ -4,9 +4,22 @@
 """
 
 import ast
+import logging
+import os
 import re
+from collections import deque
+from collections.abc import Callable, Iterator
 from dataclasses import dataclass, field
 from pathlib import Path
+from typing import TypeVar
+
+from src.infrastructure.analyzer.file_walker import iter_project_files
+from src.infrastructure.analyzer.parsed_file import ParsedFile, ParsedFileCache
+from src.infrastructure.analyzer.result_cache import AnalysisResultCache, content_digest, file_stamp
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
 
 # Директории для игнорирования (как в project_analyzer)
 IGNORE_DIRS = {
@@ -29,6 +42,29 @@ IGNORE_DIRS = {
 PY_EXT = (".py",)
 TS_JS_EXT = (".ts", ".tsx", ".js", ".jsx", ".mjs")
 
+# Предел числа файлов в графе: обход останавливается, не дочитывая огромные деревья
+MAX_GRAPH_FILES = 20000
+
+# Файлов на пачку при сверке с кэшем результатов
+PARSE_BATCH = 64
+
+# TS/JS import patterns. Kept as separate scans on purpose: each starts with a literal that re
+# searches for quickly; one alternation of all of them was ~3x slower on real TS/JS sources.
+# import x from 'path'; import type { A } from "path"; import x, { a } from 'path';
+# import * as ns from 'path'; import 'side-effect'; import('lazy')
+# The lookbehind after the literal rejects identifiers ending in the keyword (reimport(...), obj.import(...));
+# placed after the literal it keeps the fast literal search.
+_TS_IMPORT_RE = re.compile(
+    r"""import(?<![\w$.]import)(?:\s+(?:type\s+)?(?:(?:[\w$]+\s*,\s*)?(?:\{[^}]*\}|\*\s+as\s+[\w$]+|[\w$]+)\s+from\s+)?|\s*\(\s*)"""
+    r"""['"`]([^'"`]+)['"`]"""
+)
+# export { a } from 'path'; export * from 'path'; export * as ns from 'path'
+_TS_EXPORT_FROM_RE = re.compile(
+    r"""export(?<![\w$.]export)\s+(?:type\s+)?(?:\{[^}]*\}|\*(?:\s+as\s+[\w$]+)?)\s*from\s+['"]([^'"]+)['"]"""
+)
+# require('path')
+_TS_REQUIRE_RE = re.compile(r"""require(?<![\w$.]require)\s*\(\s*['"`]([^'"`]+)['"`]\s*\)""")
+
 
 @dataclass
 class ImportEdge:
@@ -50,114 +86,100 @@ class DependencyGraphResult:
     edge_count: int = 0
 
 
-def _collect_code_files(project_path: Path) -> tuple[list[Path], list[Path]]:
-    """Собирает пути к Python и TS/JS файлам (относительно project_path не меняем — вернём Path)."""
+def _iter_code_files(project_path: Path) -> Iterator[tuple[str, Path]]:
+    """Лениво отдаёт ("py", path) / ("ts", path) по мере обхода дерева."""
+    for entry in iter_project_files(project_path, IGNORE_DIRS):
+        ext = os.path.splitext(entry.name)[1].lower()
+        if ext in PY_EXT:
+            yield "py", Path(entry.path)
+        elif ext in TS_JS_EXT:
+            yield "ts", Path(entry.path)
+
+
+def _collect_code_files(project_path: Path, max_files: int = MAX_GRAPH_FILES) -> tuple[list[Path], list[Path]]:
+    """Собирает пути к Python и TS/JS файлам (не больше max_files, остальное дерево не обходится).
+
+    Списки нужны целиком: разрешение импортов идёт по множеству всех файлов проекта.
+    """
     py_files: list[Path] = []
     ts_files: list[Path] = []
 
-    for p in project_path.rglob("*"):
-        if not p.is_file():
-            continue
-        if any(ignored in p.parts for ignored in IGNORE_DIRS):
-            continue
-        if p.suffix.lower() in PY_EXT:
-            py_files.append(p)
-        elif p.suffix.lower() in TS_JS_EXT:
-            ts_files.append(p)
+    for count, (kind, fp) in enumerate(_iter_code_files(project_path)):
+        if count >= max_files:
+            logger.warning("Reached max file limit (%d), stopping dependency graph collection", max_files)
+            break
+        (py_files if kind == "py" else ts_files).append(fp)
 
     return py_files, ts_files
 
 
-def _module_to_possible_paths(module: str, base: Path) -> list[Path]:
-    """Преобразует имя модуля Python в возможные пути к файлу."""
-    parts = module.split(".")
-    candidates: list[Path] = []
-    # file: base / src / api / routes.py
-    file_path = base / parts[0]
-    for part in parts[1:]:
-        file_path = file_path / part
-    candidates.append(file_path.with_suffix(".py"))
-    # package: base / src / api / routes / __init__.py
-    candidates.append(file_path / "__init__.py")
-    return [c for c in candidates if c.is_relative_to(base)]
+def _module_to_possible_paths(module: str) -> tuple[str, str]:
+    """Преобразует имя модуля Python в возможные пути к файлу (posix, относительно корня).
 
+    src.api.routes -> src/api/routes.py, src/api/routes/__init__.py
+    """
+    mod_path = module.replace(".", "/")
+    return f"{mod_path}.py", f"{mod_path}/__init__.py"
 
-def _resolve_python_import(
-    module: str,
-    from_file: Path,
-    base_path: Path,
-    py_files_set: set[Path],
-) -> Path | None:
-    """Разрешает импорт Python до пути к файлу (относительно base_path)."""
+
+def _resolve_python_import(module: str, from_dir: str, py_files: set[str]) -> str | None:
+    """Разрешает импорт Python до пути к файлу.
+
+    Все пути — posix-строки относительно корня проекта (хеширование str дешевле Path);
+    from_dir — директория импортирующего файла ("" для корня).
+    """
+    prefix = f"{from_dir}/" if from_dir else ""
     # Относительный импорт: from .foo import bar -> от директории текущего файла
     if module.startswith("."):
-        parent = from_file.parent
         rel = module.lstrip(".")
         if not rel:
             # from . import ...
-            target = parent / "__init__.py"
-        else:
-            parts = rel.split(".")
-            target = parent
-            for p in parts:
-                target = target / p
-            target_py = target.with_suffix(".py")
-            target_init = target / "__init__.py"
-            if target_py in py_files_set:
-                return target_py
-            if target_init in py_files_set:
-                return target_init
-            return None
+            target_init = f"{prefix}__init__.py"
+            return target_init if target_init in py_files else None
+        for cand in _module_to_possible_paths(rel):
+            if prefix + cand in py_files:
+                return prefix + cand
+        return None
 
     # Абсолютный: ищем от корня проекта
-    for cand in _module_to_possible_paths(module, base_path):
-        if cand in py_files_set:
+    for cand in _module_to_possible_paths(module):
+        if cand in py_files:
             return cand
     # Попробуем от директории файла (локальный пакет)
-    parent = from_file.parent
     rel_parts = module.split(".")
     for i in range(len(rel_parts), 0, -1):
-        sub = parent / Path(*rel_parts[:i])
-        if sub.with_suffix(".py") in py_files_set:
-            return sub.with_suffix(".py")
-        if (sub / "__init__.py") in py_files_set:
-            return sub / "__init__.py"
+        for cand in _module_to_possible_paths(".".join(rel_parts[:i])):
+            if prefix + cand in py_files:
+                return prefix + cand
     return None
 
 
-def _extract_python_imports(content: str) -> list[tuple[str, list[str]]]:
-    """Извлекает импорты из Python-кода: (module, [names])."""
-    result: list[tuple[str, list[str]]] = []
-    try:
-        tree = ast.parse(content)
-    except SyntaxError:
-        return result
+def _scan_python_tree(tree: ast.AST) -> tuple[list[tuple[str, list[str]]], set[str]]:
+    """Один проход по AST: импорты (module, [names]) и имена, читаемые в коде.
 
+    Для a.b.c достаточно Name "a" (ctx=Load), который ast.walk и так отдаёт —
+    цепочку атрибутов разворачивать не нужно.
+    """
+    imports: list[tuple[str, list[str]]] = []
+    used_names: set[str] = set()
     for node in ast.walk(tree):
-        if isinstance(node, ast.Import):
+        if isinstance(node, ast.Name):
+            if isinstance(node.ctx, ast.Load):
+                used_names.add(node.id)
+        elif isinstance(node, ast.Import):
             for alias in node.names:
-                result.append((alias.name, [alias.asname or alias.name]))
+                imports.append((alias.name, [alias.asname or alias.name]))
         elif isinstance(node, ast.ImportFrom):
             if node.module is None:
                 continue
             names = [a.asname or a.name for a in node.names]
-            result.append((node.module, names))
-    return result
+            imports.append((node.module, names))
+    return imports, used_names
 
 
 def _extract_ts_imports(content: str) -> list[str]:
-    """Извлекает пути/модули из TypeScript/JS (import/require)."""
-    result: list[str] = []
-    # import x from 'path'; import { a } from "path"; import 'side-effect';
-    for m in re.finditer(
-        r"""import\s+(?:(?:\{[^}]*\}|\*\s+as\s+\w+|\w+)\s+from\s+)?['"]([^'"]+)['"]""",
-        content,
-    ):
-        result.append(m.group(1))
-    # require('path')
-    for m in re.finditer(r"""require\s*\(\s*['"]([^'"]+)['"]\s*\)""", content):
-        result.append(m.group(1))
-    return result
+    """Извлекает пути/модули из TypeScript/JS (import, import(), export ... from, require)."""
+    return _TS_IMPORT_RE.findall(content) + _TS_EXPORT_FROM_RE.findall(content) + _TS_REQUIRE_RE.findall(content)
 
 
 def _resolve_ts_import(
@@ -192,106 +214,213 @@ def _resolve_ts_import(
     return None
 
 
+def _strongly_connected_components(adj: dict[str, list[str]]) -> list[list[str]]:
+    """Компоненты сильной связности (алгоритм Тарьяна, итеративно — без рекурсии).
+
+    Узлы без исходящих рёбер (только в списках соседей) тоже учитываются.
+    """
+    index: dict[str, int] = {}
+    lowlink: dict[str, int] = {}
+    on_stack: set[str] = set()
+    scc_stack: list[str] = []
+    components: list[list[str]] = []
+    # Явный стек обхода: (узел, итератор по ещё не просмотренным соседям)
+    work: list[tuple[str, Iterator[str]]] = []
+
+    def push(node: str) -> None:
+        index[node] = lowlink[node] = len(index)
+        scc_stack.append(node)
+        on_stack.add(node)
+        work.append((node, iter(adj.get(node, ()))))
+
+    for root in adj:
+        if root in index:
+            continue
+        push(root)
+        while work:
+            node, neighbors = work[-1]
+            for neighbor in neighbors:
+                if neighbor not in index:
+                    push(neighbor)
+                    break
+                if neighbor in on_stack:
+                    lowlink[node] = min(lowlink[node], index[neighbor])
+            else:
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    lowlink[parent] = min(lowlink[parent], lowlink[node])
+                if lowlink[node] == index[node]:
+                    component: list[str] = []
+                    while True:
+                        member = scc_stack.pop()
+                        on_stack.discard(member)
+                        component.append(member)
+                        if member == node:
+                            break
+                    components.append(component)
+    return components
+
+
+def _cycle_through(start: str, members: set[str], adj: dict[str, list[str]]) -> list[str]:
+    """Кратчайший цикл из start обратно в start внутри компоненты (BFS): [start, ..., start]."""
+    parent: dict[str, str] = {}
+    queue = deque([start])
+    while queue:
+        node = queue.popleft()
+        for neighbor in adj.get(node, ()):
+            if neighbor == start:
+                path = [node]
+                while path[-1] != start:
+                    path.append(parent[path[-1]])
+                path.reverse()
+                return [*path, start]
+            if neighbor in members and neighbor not in parent:
+                parent[neighbor] = node
+                queue.append(neighbor)
+    return [start, start]  # недостижимо для компоненты сильной связности
+
+
 def _find_cycles(adj: dict[str, list[str]]) -> list[list[str]]:
-    """Поиск циклов в графе (DFS). Возвращает список циклов (каждый — список узлов)."""
-    cycles: list[list[str]] = []
-    visited: set[str] = set()
-    rec_stack: set[str] = set()
-    path: list[str] = []
-    node_to_index: dict[str, int] = {}
-
-    def dfs(node: str) -> None:
-        visited.add(node)
-        rec_stack.add(node)
-        path.append(node)
-        node_to_index[node] = len(path) - 1
-
-        for neighbor in adj.get(node, []):
-            if neighbor not in visited:
-                dfs(neighbor)
-            elif neighbor in rec_stack:
-                start = node_to_index[neighbor]
-                cycle = path[start:] + [neighbor]
-                cycles.append(cycle)
-
-        path.pop()
-        rec_stack.discard(node)
-        del node_to_index[node]
-
-    for n in adj:
-        if n not in visited:
-            dfs(n)
+    """Циклы в графе: по одному на каждую компоненту сильной связности с циклом.
 
+    Каждый цикл — список узлов, где последний совпадает с первым. O(V + E), без рекурсии,
+    поэтому глубокие цепочки импортов не упираются в лимит рекурсии.
+    """
+    order = {node: i for i, node in enumerate(adj)}
+    cycles: list[list[str]] = []
+    for component in _strongly_connected_components(adj):
+        if len(component) == 1 and component[0] not in adj.get(component[0], ()):
+            continue
+        # Стартуем с узла, раньше всех встретившегося в графе — порядок стабилен между запусками
+        start = min(component, key=lambda n: order.get(n, len(order)))
+        cycles.append(_cycle_through(start, set(component), adj))
     return cycles
 
 
 def _find_unused_python_imports(
     rel_path: str,
-    content: str,
     imports: list[tuple[str, list[str]]],
+    used_names: set[str],
 ) -> list[tuple[str, str]]:
     """Для Python: неиспользуемые импорты (имена не встречаются в коде после импортов)."""
-    unused: list[tuple[str, str]] = []
-    try:
-        tree = ast.parse(content)
-    except SyntaxError:
-        return unused
+    return [(rel_path, name) for _module, names in imports for name in names if name not in used_names]
 
-    # Собираем все имена, которые используются в коде (кроме определений и импортов)
-    used_names: set[str] = set()
-    import_names: set[str] = set()
 
-    for node in ast.walk(tree):
-        if isinstance(node, (ast.Import, ast.ImportFrom)):
-            for alias in node.names if hasattr(node, "names") else getattr(node, "names", []):
-                name = alias.asname or alias.name
-                import_names.add(name)
+def _python_file_imports(parsed: ParsedFile) -> tuple[list[tuple[str, list[str]]], list[str]]:
+    """Импорты файла и имена неиспользуемых импортов (не зависят от остальных файлов — кэшируются)."""
+    if parsed.tree is None:
+        return [], []
+    imports, used_names = _scan_python_tree(parsed.tree)
+    unused = [name for _, name in _find_unused_python_imports("", imports, used_names)]
+    return imports, unused
+
+
+def _ts_file_imports(parsed: ParsedFile) -> list[str]:
+    """Спецификаторы import/require файла TS/JS."""
+    return _extract_ts_imports(parsed.content)
+
+
+def _per_file(
+    files: list[Path],
+    cache: ParsedFileCache,
+    store: AnalysisResultCache | None,
+    kind: str,
+    compute: Callable[[ParsedFile], T],
+) -> dict[Path, T]:
+    """compute(parsed) для каждого читаемого файла; для неизменённых файлов результат берётся из store.
+
+    Файлы с прежним (mtime, size) не читаются; для остальных сверяется хеш содержимого.
+    """
+    if store is None:
+        return {fp: compute(parsed) for fp in files if (parsed := cache.get(fp)) is not None}
+
+    stamps: dict[str, str] = {}
+    for fp in files:
+        try:
+            stamps[str(fp)] = file_stamp(fp.stat())
+        except OSError:
             continue
-        if isinstance(node, ast.Name) and isinstance(node.ctx, ast.Load):
-            used_names.add(node.id)
-        if isinstance(node, ast.Attribute):
-            # только первый сегмент атрибута (a.b.c -> a)
-            n = node
-            while isinstance(n, ast.Attribute):
-                n = n.value
-            if isinstance(n, ast.Name):
-                used_names.add(n.id)
-
-    for _module, names in imports:
-        for name in names:
-            if name not in used_names and name in import_names:
-                unused.append((rel_path, name))
-    return unused
-
-
-def build_dependency_graph(project_path: str | Path) -> DependencyGraphResult:
-    """Строит граф зависимостей по проекту, находит циклы и неиспользуемые импорты."""
+    unchanged = store.get_unchanged(kind, stamps)
+
+    # Пачками, чтобы файлы пачки ещё были в ParsedFileCache при разборе промахов;
+    # сами ParsedFile не удерживаются — память ограничена размером кэша
+    pending = [fp for fp in files if str(fp) not in unchanged]
+    computed: dict[Path, T] = {}
+    fresh: list[tuple[str, str, T]] = []
+    for start in range(0, len(pending), PARSE_BATCH):
+        digests: dict[str, str] = {}
+        for fp in pending[start : start + PARSE_BATCH]:
+            if (parsed := cache.get(fp)) is not None:
+                digests[str(fp)] = content_digest(parsed.content)
+        cached = store.get_many(kind, digests)
+        for fp in pending[start : start + PARSE_BATCH]:
+            key = str(fp)
+            if key in cached:
+                computed[fp] = cached[key]
+            elif key in digests and (parsed := cache.get(fp)) is not None:
+                computed[fp] = compute(parsed)
+            else:
+                continue
+            # Тот же хеш при новом stamp — перезаписываем, чтобы в следующий раз не читать файл
+            fresh.append((key, digests[key], computed[fp]))
+    results: dict[Path, T] = {}
+    for fp in files:
+        if (key := str(fp)) in unchanged:
+            results[fp] = unchanged[key]
+        elif fp in computed:
+            results[fp] = computed[fp]
+    store.put_many(kind, fresh, stamps)
+    return results
+
+
+def build_dependency_graph(
+    project_path: str | Path,
+    cache: ParsedFileCache | None = None,
+    cache_dir: str | Path | None = None,
+) -> DependencyGraphResult:
+    """Строит граф зависимостей по проекту, находит циклы и неиспользуемые импорты.
+
+    cache — общий кэш содержимого/AST (например, от ProjectAnalyzer того же прогона).
+    cache_dir — каталог кэша результатов между запусками: импорты неизменённых файлов
+    не извлекаются заново; разрешение импортов и поиск циклов выполняются всегда.
+    """
     base = Path(project_path).resolve()
     if not base.is_dir():
         return DependencyGraphResult()
 
     py_files, ts_files = _collect_code_files(base)
-    py_set = set(py_files)
     ts_set = set(ts_files)
 
-    edges: list[ImportEdge] = []
+    # (from_file, to_file) -> имя первого импорта; повторные импорты той же пары не дублируются
+    edge_names: dict[tuple[str, str], str] = {}
     unused: list[tuple[str, str]] = []
+    cache = cache or ParsedFileCache()
 
-    # Python
-    for fp in py_files:
-        try:
-            content = fp.read_text(encoding="utf-8", errors="replace")
-        except OSError:
-            continue
-        rel_from = str(fp.relative_to(base)).replace("\\", "/")
-        imports = _extract_python_imports(content)
-        for module, names in imports:
-            resolved = _resolve_python_import(module, fp, base, py_set)
-            if resolved is not None:
-                rel_to = str(resolved.relative_to(base)).replace("\\", "/")
-                if rel_from != rel_to:
-                    edges.append(ImportEdge(from_file=rel_from, to_file=rel_to, name=module))
-        unused.extend(_find_unused_python_imports(rel_from, content, imports))
+    store = AnalysisResultCache(cache_dir) if cache_dir else None
+    try:
+        py_imports = _per_file(py_files, cache, store, "py_imports", _python_file_imports)
+        ts_imports = _per_file(ts_files, cache, store, "ts_imports", _ts_file_imports)
+        # Обход полный (лимит не достигнут) — записи исчезнувших файлов под корнем удаляем
+        if store is not None and len(py_files) + len(ts_files) < MAX_GRAPH_FILES:
+            prefix = f"{base}{os.sep}"
+            store.prune("py_imports", prefix, {str(fp) for fp in py_files})
+            store.prune("ts_imports", prefix, {str(fp) for fp in ts_files})
+    finally:
+        if store is not None:
+            store.close()
+
+    # Python: разрешение по posix-строкам относительно корня
+    py_rel = {fp: fp.relative_to(base).as_posix() for fp in py_files}
+    py_rel_set = set(py_rel.values())
+    for fp, (imports, unused_names) in py_imports.items():
+        rel_from = py_rel[fp]
+        from_dir = rel_from.rpartition("/")[0]
+        for module, _names in imports:
+            rel_to = _resolve_python_import(module, from_dir, py_rel_set)
+            if rel_to is not None and rel_from != rel_to:
+                edge_names.setdefault((rel_from, rel_to), module)
+        unused.extend((rel_from, name) for name in unused_names)
 
     # Deduplicate unused by (file, name)
     seen_unused: set[tuple[str, str]] = set()
@@ -304,28 +433,23 @@ def build_dependency_graph(project_path: str | Path) -> DependencyGraphResult:
     unused = unique_unused
 
     # TypeScript/JS
-    for fp in ts_files:
-        try:
-            content = fp.read_text(encoding="utf-8", errors="replace")
-        except OSError:
-            continue
+    for fp, specs in ts_imports.items():
         rel_from = str(fp.relative_to(base)).replace("\\", "/")
-        for spec in _extract_ts_imports(content):
+        for spec in specs:
             resolved = _resolve_ts_import(spec, fp, base, ts_set)
             if resolved is not None:
                 rel_to = str(resolved.relative_to(base)).replace("\\", "/")
                 if rel_from != rel_to:
-                    edges.append(ImportEdge(from_file=rel_from, to_file=rel_to, name=spec))
+                    edge_names.setdefault((rel_from, rel_to), spec)
 
-    # Граф: from_file -> [to_file, ...]
+    # Граф: from_file -> [to_file, ...] (пары уже уникальны)
     adj: dict[str, list[str]] = {}
-    for e in edges:
-        adj.setdefault(e.from_file, []).append(e.to_file)
-    for n in list(adj):
-        adj[n] = list(dict.fromkeys(adj[n]))
+    for from_file, to_file in edge_names:
+        adj.setdefault(from_file, []).append(to_file)
 
     cycles = _find_cycles(adj)
-    nodes = set(adj) | {e.to_file for e in edges}
+    nodes = set(adj) | {to_file for _, to_file in edge_names}
+    edges = [ImportEdge(from_file=f, to_file=t, name=name) for (f, t), name in edge_names.items()]
 
     return DependencyGraphResult(
         edges=edges,
@@ -0,0 +1,86 @@
+"""Project file walker for analysis.
+
+Walks a project tree with os.scandir and prunes ignored directories
+(.venv, node_modules, ...) at the directory boundary, so their contents
+are never listed or stat()ed; also detects generated code files by a
+marker comment (# @generated, // DO NOT EDIT) in their first lines.
+Used by ProjectAnalyzer and build_dependency_graph.
+"""
+
+import os
+import re
+from collections.abc import Collection, Iterator
+from pathlib import Path
+
+# Сколько байт и строк от начала файла проверять на маркер генерации
+GENERATED_HEADER_BYTES = 256
+GENERATED_HEADER_LINES = 5
+
+# Маркер генерации (protoc, codegen) учитывается только в строке-комментарии:
+# упоминание в docstring, строковом литерале или README файл не исключает
+_GENERATED_MARKER = rb"(?:@generated|do not edit|auto-?generated)"
+_GENERATED_COMMENT_RES = {
+    "#": re.compile(rb"^[ \t]*#[^\n]*" + _GENERATED_MARKER, re.IGNORECASE | re.MULTILINE),
+    "//": re.compile(rb"^[ \t]*//[^\n]*" + _GENERATED_MARKER, re.IGNORECASE | re.MULTILINE),
+}
+
+# Код, для которого проверяется маркер: расширение -> префикс строчного комментария
+GENERATED_COMMENT_PREFIXES = {
+    ".py": "#",
+    ".js": "//",
+    ".jsx": "//",
+    ".mjs": "//",
+    ".ts": "//",
+    ".tsx": "//",
+}
+
+
+def iter_project_files(
+    root: Path, ignore_dirs: Collection[str], *, strict_root: bool = False
+) -> Iterator[os.DirEntry[str]]:
+    """Обходит дерево под root и возвращает DirEntry обычных файлов.
+
+    Директории с именем из ignore_dirs не обходятся. Симлинки на директории
+    не разворачиваются (как в Path.rglob), нечитаемые директории пропускаются.
+    strict_root=True: ошибка чтения самого root (OSError) пробрасывается вызывающему.
+    """
+    stack = [str(root)]
+    while stack:
+        current = stack.pop()
+        try:
+            with os.scandir(current) as it:
+                entries = list(it)
+        except OSError:
+            if strict_root and current == str(root):
+                raise
+            continue
+        subdirs: list[str] = []
+        for entry in entries:
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    if entry.name not in ignore_dirs:
+                        subdirs.append(entry.path)
+                elif entry.is_file():
+                    yield entry
+            except OSError:
+                continue
+        # Обратный порядок: директории обходятся в порядке листинга
+        stack.extend(reversed(subdirs))
+
+
+def is_generated_file(path: str | os.PathLike[str]) -> bool:
+    """True, если файл кода начинается с комментария-маркера генерации (# @generated, // DO NOT EDIT, ...).
+
+    Проверяются только первые GENERATED_HEADER_LINES строк заголовка и только файлы
+    из GENERATED_COMMENT_PREFIXES; нечитаемый файл считается несгенерированным.
+    """
+    prefix = GENERATED_COMMENT_PREFIXES.get(os.path.splitext(path)[1].lower())
+    if prefix is None:
+        return False
+    try:
+        with open(path, "rb") as f:
+            head = f.read(GENERATED_HEADER_BYTES)
+    except OSError:
+        return False
+    lines = head.split(b"\n", GENERATED_HEADER_LINES)[:GENERATED_HEADER_LINES]
+    return _GENERATED_COMMENT_RES[prefix].search(b"\n".join(lines)) is not None
@@ -7,9 +7,9 @@ ArchitectureInfo, ProjectAnalysis. Used by ProjectAnalyzer and ReportGenerator.
 from dataclasses import dataclass, field
 
 
-@dataclass
+@dataclass(slots=True)
 class FileMetrics:
-    """Метрики одного файла."""
+    """Метрики одного файла (slots: экземпляров по одному на файл)."""
 
     path: str
     lines_total: int = 0
@@ -23,7 +23,7 @@ class FileMetrics:
     issues: list[str] = field(default_factory=list)
 
 
-@dataclass
+@dataclass(slots=True)
 class SecurityIssue:
     """Проблема безопасности."""
 
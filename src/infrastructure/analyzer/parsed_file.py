@@ -0,0 +1,94 @@
+"""Parsed file cache for project analysis.
+
+Reads each file and parses Python sources once per analysis run, so that
+file metrics, architecture, code smells and the dependency graph share the
+same content and AST instead of re-reading and re-parsing every file.
+The cache is a bounded LRU: an AST costs several times its source, so keeping
+every file of a large tree alive would grow memory with the project.
+Used by ProjectAnalyzer and build_dependency_graph.
+"""
+
+import ast
+import threading
+from collections import OrderedDict
+from functools import cached_property
+from pathlib import Path
+
+# Суммарный размер исходников в кэше (символов); AST занимает в десятки раз больше исходника
+MAX_CACHED_CHARS = 2_000_000
+
+
+class ParsedFile:
+    """Содержимое файла и (для Python) его AST, разбираемый при первом обращении."""
+
+    def __init__(self, content: str, is_python: bool) -> None:
+        """Сохраняет содержимое; AST строится лениво (не нужен, если результат взят из кэша)."""
+        self.content = content
+        self.is_python = is_python
+
+    @cached_property
+    def tree(self) -> ast.Module | None:
+        """AST модуля; None для не-Python файлов и при SyntaxError."""
+        if not self.is_python:
+            return None
+        try:
+            return ast.parse(self.content)
+        except (SyntaxError, ValueError):  # ValueError: null bytes in source
+            return None
+
+    @property
+    def syntax_error(self) -> bool:
+        """True, если Python-файл не разбирается."""
+        return self.is_python and self.tree is None
+
+
+class ParsedFileCache:
+    """Кэш прочитанных и распарсенных файлов на время одного анализа.
+
+    Ключ — (path, mtime_ns, size): изменённый на диске файл перечитывается.
+    Хранит файлы суммарным размером до max_chars символов, вытесняя давно не запрошенные
+    (последний прочитанный файл остаётся, даже если он один больше лимита).
+    Потокобезопасен (ProjectAnalyzer обрабатывает файлы в ThreadPoolExecutor).
+    """
+
+    def __init__(self, max_chars: int = MAX_CACHED_CHARS) -> None:
+        """Создаёт пустой кэш на max_chars символов исходников."""
+        self._entries: OrderedDict[str, tuple[int, int, ParsedFile]] = OrderedDict()
+        self._max_chars = max_chars
+        self._chars = 0
+        self._lock = threading.Lock()
+
+    def get(self, file_path: Path) -> ParsedFile | None:
+        """Возвращает ParsedFile для пути; None, если файл не читается."""
+        try:
+            st = file_path.stat()
+        except OSError:
+            return None
+        key = str(file_path)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+        if entry is not None and entry[0] == st.st_mtime_ns and entry[1] == st.st_size:
+            return entry[2]
+
+        try:
+            content = file_path.read_text(encoding="utf-8", errors="replace")
+        except OSError:
+            return None
+        parsed = ParsedFile(content, is_python=file_path.suffix == ".py")
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._chars -= len(old[2].content)
+            self._entries[key] = (st.st_mtime_ns, st.st_size, parsed)
+            self._chars += len(content)
+            while self._chars > self._max_chars and len(self._entries) > 1:
+                self._chars -= len(self._entries.popitem(last=False)[1][2].content)
+        return parsed
+
+    def clear(self) -> None:
+        """Очищает кэш."""
+        with self._lock:
+            self._entries.clear()
+            self._chars = 0
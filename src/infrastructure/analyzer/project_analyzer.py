@@ -10,19 +10,28 @@ Production-ready with:
 """
 
 import logging
+import multiprocessing
 import os
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
 from datetime import datetime
+from functools import partial
+from itertools import repeat
 from pathlib import Path
 
 from src.infrastructure.analyzer.architecture import analyze_architecture
-from src.infrastructure.analyzer.code_smells import find_code_smells
+from src.infrastructure.analyzer.code_smells import MAX_SMELLS, find_code_smells
 from src.infrastructure.analyzer.file_metrics import compute_file_metrics
+from src.infrastructure.analyzer.file_walker import is_generated_file, iter_project_files
 from src.infrastructure.analyzer.models import (
     FileMetrics,
     ProjectAnalysis,
     SecurityIssue,
 )
+from src.infrastructure.analyzer.parsed_file import ParsedFileCache
+from src.infrastructure.analyzer.result_cache import AnalysisResultCache, content_digest, file_stamp
 from src.infrastructure.analyzer.security_scanner import check_file_security
 
 logger = logging.getLogger(__name__)
@@ -30,6 +39,74 @@ logger = logging.getLogger(__name__)
 # Number of workers for parallel file processing
 MAX_WORKERS = 8
 
+# From this many files per-file analysis runs in worker processes (AST parsing holds the GIL);
+# below it process startup costs more than it saves and a thread pool is used.
+PROCESS_POOL_MIN_FILES = 300
+
+# Below this many files analysis runs in the calling thread (no pool);
+# above it a thread pool of about one worker per 8 files, capped by MAX_WORKERS.
+SERIAL_MAX_FILES = 16
+
+# Per-file result: metrics (None on error), security issues, code smells
+FileResult = tuple[FileMetrics | None, list[SecurityIssue], list[str]]
+
+
+def _analyze_file(file_path: str, base_path: str, cache: ParsedFileCache | None = None) -> FileResult:
+    """Анализирует один файл: метрики, проблемы безопасности, code smells.
+
+    Функция модульного уровня и пути-строки — чтобы её можно было отправить в ProcessPoolExecutor.
+    """
+    fp = Path(file_path)
+    base = Path(base_path)
+    cache = cache or ParsedFileCache()
+    try:
+        metrics = compute_file_metrics(fp, base, cache)
+        security_issues = check_file_security(fp, base, cache)
+        smells = find_code_smells([fp], base, cache)
+        return metrics, security_issues, smells
+    except Exception as e:
+        logger.debug("Error analyzing %s: %s", file_path, e)
+        return None, [], []
+
+
+# Markdown-файлы, которые считаются документацией (как LANGUAGE_EXTENSIONS["Markdown"])
+_DOC_SUFFIXES = (".md", ".mdx")
+
+
+@dataclass(frozen=True)
+class _MetricsSummary:
+    """Агрегаты по file_metrics для scores и рекомендаций (считаются одним проходом)."""
+
+    large_files: int = 0  # > 500 строк кода
+    complex_files: int = 0  # сложность > 20
+    has_tests: bool = False
+    has_docs: bool = False  # есть Markdown (.md, .mdx)
+    total_comments: int = 0
+    total_complexity: int = 0
+    files: int = 0
+
+    @property
+    def avg_complexity(self) -> float:
+        return self.total_complexity / max(1, self.files)
+
+
+def _summarize_metrics(file_metrics: list[FileMetrics]) -> _MetricsSummary:
+    """Один проход по метрикам файлов вместо отдельного прохода на каждый агрегат."""
+    large = complex_ = comments = complexity = 0
+    has_tests = has_docs = False
+    for f in file_metrics:
+        if f.lines_code > 500:
+            large += 1
+        if f.complexity > 20:
+            complex_ += 1
+        if not has_tests and "test" in f.path.lower():
+            has_tests = True
+        if not has_docs and f.path.endswith(_DOC_SUFFIXES):
+            has_docs = True
+        comments += f.lines_comment
+        complexity += f.complexity
+    return _MetricsSummary(large, complex_, has_tests, has_docs, comments, complexity, len(file_metrics))
+
 
 class ProjectAnalyzer:
     """Анализатор проектов.
@@ -56,6 +133,9 @@ class ProjectAnalyzer:
         "TOML": [".toml"],
     }
 
+    # Обратный индекс: расширение -> язык (один поиск вместо перебора языков)
+    _EXT_TO_LANG = {ext: lang for lang, exts in LANGUAGE_EXTENSIONS.items() for ext in exts}
+
     # Директории для игнорирования
     IGNORE_DIRS = {
         ".git",
@@ -74,22 +154,37 @@ class ProjectAnalyzer:
         "eggs",
     }
 
-    def __init__(self, max_file_size: int = 1024 * 1024):
+    def __init__(
+        self,
+        max_file_size: int = 1024 * 1024,
+        cache_dir: str | Path | None = None,
+        max_workers: int | None = None,
+    ):
         """Инициализация анализатора.
 
         Args:
             max_file_size: Максимальный размер файла для анализа (байты)
+            cache_dir: Каталог для кэша результатов по файлам между запусками
+                (неизменённые файлы не анализируются повторно); None — без кэша
+            max_workers: Число параллельных обработчиков файлов; None — по числу CPU
+                для процессов и MAX_WORKERS для потоков, 1 — без пула процессов
 
         """
         if max_file_size <= 0:
             raise ValueError("max_file_size must be positive")
+        if max_workers is not None and max_workers <= 0:
+            raise ValueError("max_workers must be positive")
         self.max_file_size = max_file_size
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self.max_workers = max_workers
 
-    def analyze(self, project_path: str) -> ProjectAnalysis:
+    def analyze(self, project_path: str, cache: ParsedFileCache | None = None) -> ProjectAnalysis:
         """Полный анализ проекта.
 
         Args:
             project_path: Путь к проекту
+            cache: Кэш содержимого/AST файлов; по умолчанию — новый на каждый прогон.
+                Передайте тот же кэш в build_dependency_graph, чтобы не парсить файлы повторно.
 
         Returns:
             ProjectAnalysis с результатами
@@ -109,10 +204,6 @@ class ProjectAnalyzer:
         if not path.is_dir():
             raise ValueError(f"Project path is not a directory: {project_path}")
 
-        # Check read permission
-        if not os.access(path, os.R_OK):
-            raise ValueError(f"No read permission for: {project_path}")
-
         logger.info("Analyzing project: %s", path)
 
         analysis = ProjectAnalysis(
@@ -121,103 +212,167 @@ class ProjectAnalyzer:
             analyzed_at=datetime.now().isoformat(),
         )
 
-        # Собираем файлы
-        files = self._collect_files(path)
+        # Собираем файлы; нет прав на чтение корня — ошибка первого scandir (без отдельной проверки)
+        try:
+            files = self._collect_files(path)
+        except PermissionError as e:
+            raise ValueError(f"No read permission for: {project_path}") from e
+        except OSError as e:
+            raise ValueError(f"Cannot read project path: {project_path}") from e
         analysis.total_files = len(files)
+        # Каждый файл читается и парсится один раз за прогон
+        cache = cache or ParsedFileCache()
+
+        # Анализируем файлы параллельно; результаты — в порядке files
+        # Агрегаты копятся в локальных переменных и присваиваются analysis один раз
+        imports: dict[Path, list[str]] = {}
+        file_metrics: list[FileMetrics] = []
+        issues: list[SecurityIssue] = []
+        smells: list[str] = []
+        total_lines = total_code_lines = 0
+        for file_path, (metrics, security_issues, file_smells) in zip(
+            files, self._analyze_files(files, path, cache), strict=True
+        ):
+            if metrics is None:
+                continue
+            file_metrics.append(metrics)
+            total_lines += metrics.lines_total
+            total_code_lines += metrics.lines_code
+            imports[file_path] = metrics.imports
+            if security_issues:
+                issues.extend(security_issues)
+            if file_smells and len(smells) < MAX_SMELLS:
+                smells.extend(file_smells)
+        analysis.file_metrics = file_metrics
+        analysis.security_issues = issues
+        analysis.total_lines = total_lines
+        analysis.total_code_lines = total_code_lines
+
+        # Языки проанализированных файлов (ключи imports), подсчёт одним Counter
+        analysis.languages = dict(Counter(lang for fp in imports if (lang := self._detect_language(fp))))
+
+        # Анализ архитектуры (импорты уже собраны в метриках)
+        analysis.architecture = analyze_architecture(path, files, cache, imports)
+
+        # Code smells
+        analysis.code_smells = smells[:MAX_SMELLS]
 
-        # Анализируем файлы параллельно для производительности
-        def analyze_single_file(file_path: Path) -> tuple[FileMetrics | None, list[SecurityIssue], str | None]:
-            """Analyze a single file and return results."""
-            try:
-                metrics = compute_file_metrics(file_path, path)
-                security_issues = check_file_security(file_path, path)
-                lang = self._detect_language(file_path)
-                return metrics, security_issues, lang
-            except Exception as e:
-                logger.debug("Error analyzing %s: %s", file_path, e)
-                return None, [], None
-
-        # Use ThreadPoolExecutor for I/O-bound file operations
-        with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
-            future_to_file = {executor.submit(analyze_single_file, file_path): file_path for file_path in files}
-
-            for future in as_completed(future_to_file):
-                file_path = future_to_file[future]
-                try:
-                    metrics, security_issues, lang = future.result()
-
-                    if metrics:
-                        analysis.file_metrics.append(metrics)
-                        analysis.total_lines += metrics.lines_total
-                        analysis.total_code_lines += metrics.lines_code
+        # Расчёт scores
+        analysis.security_score = self._calculate_security_score(analysis.security_issues)
+        summary = _summarize_metrics(analysis.file_metrics)
+        analysis.quality_score = self._calculate_quality_score(analysis, summary)
 
-                    if lang:
-                        analysis.languages[lang] = analysis.languages.get(lang, 0) + 1
+        # Генерация рекомендаций
+        analysis.recommendations = self._generate_recommendations(analysis, summary)
+        analysis.strengths = self._identify_strengths(analysis, summary)
+        analysis.weaknesses = self._identify_weaknesses(analysis, summary)
 
-                    analysis.security_issues.extend(security_issues)
+        return analysis
 
-                except Exception as e:
-                    logger.debug("Failed to get result for %s: %s", file_path, e)
+    def _analyze_files(self, files: list[Path], path: Path, cache: ParsedFileCache) -> list[FileResult]:
+        """Результаты по всем файлам: из кэша для неизменённых, остальные — через _run_file_analysis.
 
-        # Анализ архитектуры
-        analysis.architecture = analyze_architecture(path, files)
+        Файлы с прежним (mtime, size) берутся из кэша без чтения; для остальных сверяется хеш содержимого.
+        """
+        if self.cache_dir is None:
+            return self._run_file_analysis(files, path, cache)
 
-        # Подсчёт code smells
-        analysis.code_smells = find_code_smells(files, path)
+        keys = [f"{path}|{file_path}" for file_path in files]  # rel-пути в результатах зависят от корня проекта
+        stamps: dict[str, str] = {}
+        for key, file_path in zip(keys, files, strict=True):
+            try:
+                stamps[key] = file_stamp(file_path.stat())
+            except OSError:
+                continue
 
-        # Расчёт scores
-        analysis.security_score = self._calculate_security_score(analysis.security_issues)
-        analysis.quality_score = self._calculate_quality_score(analysis)
+        with AnalysisResultCache(self.cache_dir) as store:
+            cached: dict[str, FileResult] = store.get_unchanged("file", stamps)
+            digests: dict[str, str] = {}
+            for key, file_path in zip(keys, files, strict=True):
+                if key not in cached and (parsed := cache.get(file_path)) is not None:
+                    digests[key] = content_digest(parsed.content)
+            # Содержимое не изменилось, хотя stamp другой (touch, checkout) — перезаписываем со свежим stamp
+            same_content: dict[str, FileResult] = store.get_many("file", digests)
+            cached.update(same_content)
+            pending = [i for i, key in enumerate(keys) if key not in cached]
+            fresh = self._run_file_analysis([files[i] for i in pending], path, cache)
+            store.put_many(
+                "file",
+                [(key, digests[key], result) for key, result in same_content.items()]
+                + [
+                    (key, digests[key], result)
+                    for i, result in zip(pending, fresh, strict=True)
+                    if (key := keys[i]) in digests and result[0] is not None
+                ],
+                stamps,
+            )
+            store.prune("file", f"{path}|", set(keys))
+
+        logger.debug("Analysis cache: %d hit(s), %d analyzed", len(files) - len(pending), len(pending))
+        fresh_by_index = dict(zip(pending, fresh, strict=True))
+        return [fresh_by_index[i] if i in fresh_by_index else cached[key] for i, key in enumerate(keys)]
+
+    def _run_file_analysis(self, files: list[Path], path: Path, cache: ParsedFileCache) -> list[FileResult]:
+        """Запускает _analyze_file по файлам: процессы для больших проектов, потоки для средних, мелкие — подряд."""
+        paths = [str(f) for f in files]
+        base = str(path)
+        workers = self.max_workers or os.cpu_count() or 1
+        if len(paths) >= PROCESS_POOL_MIN_FILES and workers > 1:
+            chunksize = max(1, len(paths) // (workers * 4))
+            try:
+                # spawn: сервер многопоточный, fork небезопасен
+                with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as ex:
+                    return list(ex.map(_analyze_file, paths, repeat(base), chunksize=chunksize))
+            except (OSError, BrokenProcessPool) as e:
+                logger.warning("Process pool unavailable, falling back to threads: %s", e)
 
-        # Генерация рекомендаций
-        analysis.recommendations = self._generate_recommendations(analysis)
-        analysis.strengths = self._identify_strengths(analysis)
-        analysis.weaknesses = self._identify_weaknesses(analysis)
+        # Мелкие проекты — без пула: создание потоков дороже самой работы
+        if len(paths) < SERIAL_MAX_FILES or self.max_workers == 1:
+            return [_analyze_file(p, base, cache) for p in paths]
 
-        return analysis
+        threads = min(self.max_workers or MAX_WORKERS, max(2, len(paths) // 8))
+        with ThreadPoolExecutor(max_workers=threads) as executor:
+            return list(executor.map(partial(_analyze_file, cache=cache), paths, repeat(base)))
 
     def _collect_files(self, path: Path) -> list[Path]:
-        """Собирает все релевантные файлы."""
+        """Собирает все релевантные файлы; OSError, если не читается сам корень."""
         files = []
 
-        for p in path.rglob("*"):
-            if not p.is_file():
-                continue
-
-            # Проверяем игнорируемые директории
-            if any(ignored in p.parts for ignored in self.IGNORE_DIRS):
+        # Игнорируемые директории отсекаются при обходе, не заходя в них
+        for entry in iter_project_files(path, self.IGNORE_DIRS, strict_root=True):
+            # Проверяем расширение (Path создаётся только для подходящих файлов)
+            if os.path.splitext(entry.name)[1].lower() not in self._EXT_TO_LANG:
                 continue
 
             # Проверяем размер
             try:
-                if p.stat().st_size > self.max_file_size:
+                if entry.stat().st_size > self.max_file_size:
                     continue
             except OSError:
                 continue
 
-            # Проверяем расширение
-            if self._detect_language(p):
-                files.append(p)
+            # Сгенерированный код (@generated, DO NOT EDIT) не несёт сигнала для метрик и smells
+            if is_generated_file(entry.path):
+                continue
+
+            files.append(Path(entry.path))
 
         return files
 
     def _detect_language(self, file_path: Path) -> str | None:
         """Определяет язык по расширению."""
-        suffix = file_path.suffix.lower()
-        for lang, extensions in self.LANGUAGE_EXTENSIONS.items():
-            if suffix in extensions:
-                return lang
-        return None
+        return self._EXT_TO_LANG.get(file_path.suffix.lower())
 
     def _calculate_security_score(self, issues: list[SecurityIssue]) -> int:
         """Рассчитывает security score."""
         score = 100
 
-        # Считаем по категориям с лимитами
-        critical_count = sum(1 for i in issues if i.severity == "critical")
-        high_count = sum(1 for i in issues if i.severity == "high")
-        medium_count = sum(1 for i in issues if i.severity == "medium")
-        low_count = sum(1 for i in issues if i.severity == "low")
+        # Считаем по категориям с лимитами (один проход по issues)
+        counts = Counter(i.severity for i in issues)
+        critical_count = counts["critical"]
+        high_count = counts["high"]
+        medium_count = counts["medium"]
+        low_count = counts["low"]
 
         # Critical/High влияют сильно
         score -= min(critical_count * 10, 50)  # Max -50 for criticals
@@ -229,8 +384,9 @@ class ProjectAnalyzer:
 
         return max(0, int(score))
 
-    def _calculate_quality_score(self, analysis: ProjectAnalysis) -> int:
-        """Рассчитывает quality score."""
+    def _calculate_quality_score(self, analysis: ProjectAnalysis, summary: _MetricsSummary | None = None) -> int:
+        """Рассчитывает quality score (summary — агрегаты file_metrics, если уже посчитаны)."""
+        summary = summary or _summarize_metrics(analysis.file_metrics)
         score = 70  # Начинаем с 70 (neutral)
 
         # Штрафы за code smells (с лимитом)
@@ -238,18 +394,16 @@ class ProjectAnalyzer:
         score -= smells_penalty
 
         # Большие файлы (лимит)
-        large_files = [f for f in analysis.file_metrics if f.lines_code > 500]
-        score -= min(len(large_files) * 3, 15)
+        score -= min(summary.large_files * 3, 15)
 
         # Высокая сложность (лимит)
-        complex_files = [f for f in analysis.file_metrics if f.complexity > 20]
-        score -= min(len(complex_files) * 3, 10)
+        score -= min(summary.complex_files * 3, 10)
 
         # Бонусы
         if analysis.total_files > 10:
             score += 10  # Modular structure
 
-        if any("test" in f.path.lower() for f in analysis.file_metrics):
+        if summary.has_tests:
             score += 15  # Has tests
 
         if len(analysis.architecture.entry_points) > 0:
@@ -259,50 +413,47 @@ class ProjectAnalyzer:
             score += 5  # Multi-language (full-stack)
 
         # Ratio of comments
-        total_comments = sum(f.lines_comment for f in analysis.file_metrics)
         if analysis.total_code_lines > 0:
-            comment_ratio = total_comments / analysis.total_code_lines
+            comment_ratio = summary.total_comments / analysis.total_code_lines
             if comment_ratio > 0.1:
                 score += 5  # Good documentation
 
         return max(0, min(100, score))
 
-    def _generate_recommendations(self, analysis: ProjectAnalysis) -> list[str]:
-        """Генерирует рекомендации."""
+    def _generate_recommendations(self, analysis: ProjectAnalysis, summary: _MetricsSummary | None = None) -> list[str]:
+        """Генерирует рекомендации (summary — агрегаты file_metrics, если уже посчитаны)."""
+        summary = summary or _summarize_metrics(analysis.file_metrics)
         recs = []
 
         # Security
-        critical_issues = [i for i in analysis.security_issues if i.severity == "critical"]
-        if critical_issues:
-            recs.append(f"🔴 КРИТИЧНО: Исправить {len(critical_issues)} критических проблем безопасности")
+        severity_counts = Counter(i.severity for i in analysis.security_issues)
+        if severity_counts["critical"]:
+            recs.append(f"🔴 КРИТИЧНО: Исправить {severity_counts['critical']} критических проблем безопасности")
 
-        high_issues = [i for i in analysis.security_issues if i.severity == "high"]
-        if high_issues:
-            recs.append(f"🟠 ВЫСОКИЙ: Устранить {len(high_issues)} проблем безопасности высокой степени")
+        if severity_counts["high"]:
+            recs.append(f"🟠 ВЫСОКИЙ: Устранить {severity_counts['high']} проблем безопасности высокой степени")
 
         # Quality
         if len(analysis.code_smells) > 5:
             recs.append(f"♻️ Рефакторинг: Обнаружено {len(analysis.code_smells)} code smells")
 
         # Structure
-        large_files = [f for f in analysis.file_metrics if f.lines_code > 500]
-        if large_files:
-            recs.append(f"📦 Разбить большие файлы: {len(large_files)} файлов превышают 500 строк")
+        if summary.large_files:
+            recs.append(f"📦 Разбить большие файлы: {summary.large_files} файлов превышают 500 строк")
 
         # Tests
-        test_files = [f for f in analysis.file_metrics if "test" in f.path.lower()]
-        if not test_files:
+        if not summary.has_tests:
             recs.append("🧪 Добавить тесты: Тестовые файлы не найдены")
 
         # Documentation
-        doc_files = [f for f in analysis.file_metrics if f.path.endswith(".md")]
-        if not doc_files:
+        if not summary.has_docs:
             recs.append("📝 Добавить документацию: Markdown-файлы не найдены")
 
         return recs[:10]
 
-    def _identify_strengths(self, analysis: ProjectAnalysis) -> list[str]:
-        """Определяет сильные стороны."""
+    def _identify_strengths(self, analysis: ProjectAnalysis, summary: _MetricsSummary | None = None) -> list[str]:
+        """Определяет сильные стороны (summary — агрегаты file_metrics, если уже посчитаны)."""
+        summary = summary or _summarize_metrics(analysis.file_metrics)
         strengths = []
 
         if analysis.security_score >= 80:
@@ -320,14 +471,14 @@ class ProjectAnalyzer:
         if len(analysis.architecture.entry_points) > 0:
             strengths.append("✅ Определены точки входа")
 
-        avg_complexity = sum(f.complexity for f in analysis.file_metrics) / max(1, len(analysis.file_metrics))
-        if avg_complexity < 10:
+        if summary.avg_complexity < 10:
             strengths.append("✅ Низкая средняя сложность")
 
         return strengths
 
-    def _identify_weaknesses(self, analysis: ProjectAnalysis) -> list[str]:
-        """Определяет слабые стороны."""
+    def _identify_weaknesses(self, analysis: ProjectAnalysis, summary: _MetricsSummary | None = None) -> list[str]:
+        """Определяет слабые стороны (summary — агрегаты file_metrics, если уже посчитаны)."""
+        summary = summary or _summarize_metrics(analysis.file_metrics)
         weaknesses = []
 
         if analysis.security_score < 50:
@@ -343,9 +494,8 @@ class ProjectAnalyzer:
         if len(analysis.code_smells) > 10:
             weaknesses.append("⚠️ Обнаружено много code smells")
 
-        large_files = [f for f in analysis.file_metrics if f.lines_code > 500]
-        if large_files:
-            weaknesses.append(f"⚠️ {len(large_files)} файлов слишком большие")
+        if summary.large_files:
+            weaknesses.append(f"⚠️ {summary.large_files} файлов слишком большие")
 
         if not analysis.architecture.entry_points:
             weaknesses.append("⚠️ Нет явных точек входа")
@@ -7,12 +7,17 @@ Production-ready with:
 - Null/empty safety checks
 """
 
+import heapq
 import re
 from datetime import datetime
 from pathlib import Path
 
 from src.infrastructure.analyzer.models import ProjectAnalysis
 
+# Звёздочки перед/после непробельного символа (экранируются в escape_markdown)
+_LEADING_STARS_RE = re.compile(r"(\*+)(?=\S)")
+_TRAILING_STARS_RE = re.compile(r"(?<=\S)(\*+)")
+
 
 def escape_markdown(text: str | None) -> str:
     """Escape markdown special characters in text.
@@ -27,8 +32,9 @@ def escape_markdown(text: str | None) -> str:
     text = text.replace("`", "\\`")
     # Escape asterisks and underscores (but not when used for emphasis)
     # Only escape at word boundaries to avoid breaking formatting
-    text = re.sub(r"(\*+)(?=\S)", r"\\\1", text)
-    text = re.sub(r"(?<=\S)(\*+)", r"\\\1", text)
+    if "*" in text:
+        text = _LEADING_STARS_RE.sub(r"\\\1", text)
+        text = _TRAILING_STARS_RE.sub(r"\\\1", text)
     return text
 
 
@@ -322,8 +328,8 @@ class ReportGenerator:
         if not analysis.file_metrics:
             return ""
 
-        # Top by lines
-        by_lines = sorted(analysis.file_metrics, key=lambda f: -f.lines_code)[:5]
+        # Top by lines (nlargest: частичная выборка вместо полной сортировки)
+        by_lines = heapq.nlargest(5, analysis.file_metrics, key=lambda f: f.lines_code)
         lines_rows = [
             f"| `{escape_markdown(safe_str(f.path, 'unknown'))}` | {f.lines_code} | {f.functions} | {f.classes} |"
             for f in by_lines
@@ -331,9 +337,9 @@ class ReportGenerator:
         ]
 
         # Top by complexity (only Python)
-        by_complexity = sorted(
-            [f for f in analysis.file_metrics if f and f.complexity > 0], key=lambda f: -f.complexity
-        )[:5]
+        by_complexity = heapq.nlargest(
+            5, (f for f in analysis.file_metrics if f and f.complexity > 0), key=lambda f: f.complexity
+        )
         complexity_rows = [
             f"| `{escape_markdown(safe_str(f.path, 'unknown'))}` | {f.complexity} |"
             for f in by_complexity
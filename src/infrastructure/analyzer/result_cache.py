@@ -0,0 +1,162 @@
+"""Persistent per-file analysis results.
+
+Stores per-file results (metrics, security issues, smells, imports) in SQLite
+keyed by absolute path and content hash, so a repeat run only re-analyzes the
+files that changed. Rows also keep the file's (mtime, size) stamp, so files
+untouched since the last run are served without reading them. Rows from other
+cache versions are dropped on open, and rows for files gone from an analyzed
+root are pruned after a full run, so the database does not grow without bound.
+Used by ProjectAnalyzer and build_dependency_graph.
+"""
+
+import hashlib
+import logging
+import os
+import pickle
+import sqlite3
+from pathlib import Path
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+RESULT_CACHE_FILENAME = "analyzer_cache.db"
+
+# Увеличить при изменении формата или логики кэшируемых результатов
+CACHE_VERSION = 6
+
+# Путей в одном запросе IN (...) — ниже лимита параметров SQLite
+_QUERY_BATCH = 500
+
+
+def content_digest(content: str) -> str:
+    """Хеш содержимого файла для ключа кэша."""
+    return hashlib.blake2b(content.encode("utf-8", errors="replace"), digest_size=16).hexdigest()
+
+
+def file_stamp(st: os.stat_result) -> str:
+    """Отпечаток файла по stat (mtime_ns, size): совпал — файл не менялся с прошлой записи."""
+    return f"{st.st_mtime_ns}:{st.st_size}"
+
+
+class AnalysisResultCache:
+    """SQLite-кэш результатов анализа по файлам: (kind, path) -> (digest, pickled value).
+
+    На каждый файл хранится одна строка на вид результата: запись с новым хешем
+    заменяет старую. Ошибки БД не прерывают анализ — кэш просто не используется.
+    Используется в пределах одного потока (соединение открывается на прогон).
+    """
+
+    def __init__(self, cache_dir: str | Path) -> None:
+        """Открывает (или создаёт) БД в cache_dir."""
+        self._db_path = Path(cache_dir) / RESULT_CACHE_FILENAME
+        self._conn: sqlite3.Connection | None = None
+        try:
+            self._db_path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self._db_path))
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS results ("
+                "kind TEXT NOT NULL, path TEXT NOT NULL, digest TEXT NOT NULL, value BLOB NOT NULL, "
+                "stamp TEXT NOT NULL DEFAULT '', PRIMARY KEY (kind, path))"
+            )
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(results)")}
+            if "stamp" not in columns:  # БД от версии без stamp
+                conn.execute("ALTER TABLE results ADD COLUMN stamp TEXT NOT NULL DEFAULT ''")
+            # Строки прежних версий кэша никогда не читаются — удаляем
+            conn.execute("DELETE FROM results WHERE kind NOT LIKE ?", (f"%:v{CACHE_VERSION}",))
+            conn.commit()
+            self._conn = conn
+        except (OSError, sqlite3.Error):
+            logger.debug("Failed to open analysis cache %s", self._db_path, exc_info=True)
+
+    def __enter__(self) -> "AnalysisResultCache":
+        """Контекстный менеджер: закрывает соединение на выходе."""
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        """Закрывает соединение."""
+        self.close()
+
+    @staticmethod
+    def _kind(kind: str) -> str:
+        return f"{kind}:v{CACHE_VERSION}"
+
+    def _get_matching(self, kind: str, expected: dict[str, str], column: str) -> dict[str, Any]:
+        """{path: value} для путей, у которых column совпадает с expected[path]."""
+        if self._conn is None or not expected:
+            return {}
+        paths = list(expected)
+        rows: list[tuple[str, str, bytes]] = []
+        try:
+            for start in range(0, len(paths), _QUERY_BATCH):
+                batch = paths[start : start + _QUERY_BATCH]
+                placeholders = ",".join("?" * len(batch))
+                rows.extend(
+                    self._conn.execute(
+                        f"SELECT path, {column}, value FROM results WHERE kind = ? AND path IN ({placeholders})",
+                        (self._kind(kind), *batch),
+                    )
+                )
+        except sqlite3.Error:
+            logger.debug("Analysis cache read failed", exc_info=True)
+            return {}
+        found: dict[str, Any] = {}
+        for path, stored, blob in rows:
+            if not stored or expected.get(path) != stored:
+                continue
+            try:
+                found[path] = pickle.loads(blob)
+            except Exception:
+                logger.debug("Dropping unreadable cache entry for %s", path)
+        return found
+
+    def get_many(self, kind: str, digests: dict[str, str]) -> dict[str, Any]:
+        """Возвращает {path: value} для путей, чей сохранённый хеш совпадает с digests[path]."""
+        return self._get_matching(kind, digests, "digest")
+
+    def get_unchanged(self, kind: str, stamps: dict[str, str]) -> dict[str, Any]:
+        """Возвращает {path: value} для путей, чей сохранённый file_stamp совпадает с stamps[path].
+
+        Позволяет не читать файл вовсе; промахи проверяются по хешу через get_many.
+        """
+        return self._get_matching(kind, stamps, "stamp")
+
+    def put_many(self, kind: str, items: list[tuple[str, str, Any]], stamps: dict[str, str] | None = None) -> None:
+        """Сохраняет [(path, digest, value), ...] одной транзакцией; stamps — file_stamp по путям."""
+        if self._conn is None or not items:
+            return
+        stamps = stamps or {}
+        rows = [
+            (self._kind(kind), path, digest, pickle.dumps(value), stamps.get(path, "")) for path, digest, value in items
+        ]
+        try:
+            with self._conn:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO results (kind, path, digest, value, stamp) VALUES (?, ?, ?, ?, ?)", rows
+                )
+        except sqlite3.Error:
+            logger.debug("Analysis cache write failed", exc_info=True)
+
+    def prune(self, kind: str, prefix: str, keep: set[str]) -> None:
+        """Удаляет записи kind с путём, начинающимся с prefix, которых нет в keep.
+
+        Вызывается после полного прогона по корню: удалённые и переименованные файлы не копятся в БД.
+        """
+        if self._conn is None:
+            return
+        try:
+            paths = self._conn.execute(
+                "SELECT path FROM results WHERE kind = ? AND substr(path, 1, ?) = ?",
+                (self._kind(kind), len(prefix), prefix),
+            ).fetchall()
+            stale = [(self._kind(kind), path) for (path,) in paths if path not in keep]
+            if stale:
+                with self._conn:
+                    self._conn.executemany("DELETE FROM results WHERE kind = ? AND path = ?", stale)
+        except sqlite3.Error:
+            logger.debug("Analysis cache prune failed", exc_info=True)
+
+    def close(self) -> None:
+        """Закрывает соединение с БД."""
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
@@ -9,20 +9,25 @@ import re
 from pathlib import Path
 
 from src.infrastructure.analyzer.models import SecurityIssue
+from src.infrastructure.analyzer.parsed_file import ParsedFileCache
 
 logger = logging.getLogger(__name__)
 
-# Паттерны безопасности (word boundaries для точности)
+# Паттерны безопасности (word boundaries для точности).
+# Проверка символа перед словом записана после литерала (eval(?<!...eval), а не (?<!...)eval):
+# так паттерн начинается с литерала и re ищет его быстро — ~5x на скане целого файла.
+# Аргументы вызовов — [^)\n], а не [^)]: совпадение всё равно ищется в пределах строки,
+# а незакрытая скобка не сканирует файл до конца (иначе квадратичное время на скане целиком).
 SECURITY_PATTERNS: list[tuple[str, str, str, str]] = [
     # Critical
     (
-        r"(?<!['\"\w])eval\s*\([^)]+\)",
+        r"eval(?<!['\"\w]eval)\s*\([^)\n]+\)",
         "critical",
         "Вызов eval()",
         "Использовать ast.literal_eval() или безопасные альтернативы",
     ),
     (
-        r"(?<![\w.])exec\s*\([^)]+\)",
+        r"exec(?<![\w.]exec)\s*\([^)\n]+\)",
         "critical",
         "Вызов exec()",
         "Переструктурировать код, избегать динамического выполнения",
@@ -33,11 +38,11 @@ SECURITY_PATTERNS: list[tuple[str, str, str, str]] = [
         "Риск shell injection",
         "Использовать shell=False и передавать аргументы списком",
     ),
-    (r"os\.system\s*\([^)]+\)", "critical", "Выполнение OS-команд", "Использовать subprocess с shell=False"),
+    (r"os\.system\s*\([^)\n]+\)", "critical", "Выполнение OS-команд", "Использовать subprocess с shell=False"),
     # High
     (r"pickle\.loads?\s*\(", "high", "Десериализация pickle", "Использовать JSON или безопасный формат"),
-    (r"yaml\.load\s*\([^)]*Loader\s*=\s*None", "high", "Небезопасная загрузка YAML", "Использовать yaml.safe_load()"),
-    (r"(?<!['\"\w])__import__\s*\(", "high", "Динамический импорт", "Использовать статические импорты"),
+    (r"yaml\.load\s*\([^)\n]*Loader\s*=\s*None", "high", "Небезопасная загрузка YAML", "Использовать yaml.safe_load()"),
+    (r"__import__(?<!['\"\w]__import__)\s*\(", "high", "Динамический импорт", "Использовать статические импорты"),
     (
         r"password\s*=\s*['\"][a-zA-Z0-9]{8,}['\"]",
         "high",
@@ -51,21 +56,46 @@ SECURITY_PATTERNS: list[tuple[str, str, str, str]] = [
     (r"\b(TODO|FIXME|HACK|XXX)\b:", "low", "Маркер TODO/FIXME", "Исправить отложенные задачи"),
 ]
 
-# Pre-compiled at module load
+# Pre-compiled at module load. ASCII: паттерны ASCII, а \s/\w без Unicode-таблиц ~1.5x быстрее
 _COMPILED_PATTERNS: list[tuple[re.Pattern[str], str, str, str]] = [
-    (re.compile(pattern, re.IGNORECASE), severity, issue, rec) for pattern, severity, issue, rec in SECURITY_PATTERNS
+    (re.compile(pattern, re.IGNORECASE | re.ASCII), severity, issue, rec)
+    for pattern, severity, issue, rec in SECURITY_PATTERNS
 ]
 
+# Подстроки (в нижнем регистре), без которых паттерн не может совпасть. Поиск подстроки
+# в str намного быстрее прохода re: паттерн без своей подстроки в файле не запускается.
+_PATTERN_KEYWORDS: dict[str, tuple[str, ...]] = {
+    "Вызов eval()": ("eval",),
+    "Вызов exec()": ("exec",),
+    "Риск shell injection": ("subprocess",),
+    "Выполнение OS-команд": ("os.system",),
+    "Десериализация pickle": ("pickle.load",),
+    "Небезопасная загрузка YAML": ("yaml.load",),
+    "Динамический импорт": ("__import__",),
+    "Пароль в коде": ("password",),
+    "API-ключ в коде": ("api",),
+    "Отключена проверка SSL": ("verify",),
+    "Маркер TODO/FIXME": ("todo", "fixme", "hack", "xxx"),
+}
 
-def check_file_security(file_path: Path, base_path: Path) -> list[SecurityIssue]:
+# Не больше стольких проблем на файл: дальше скан файла не продолжается
+MAX_ISSUES_PER_FILE = 50
+
+# По индексу паттерна в _COMPILED_PATTERNS
+_SCREEN_KEYWORDS: list[tuple[str, ...]] = [_PATTERN_KEYWORDS[issue] for _, _, issue, _ in SECURITY_PATTERNS]
+
+
+def check_file_security(file_path: Path, base_path: Path, cache: ParsedFileCache | None = None) -> list[SecurityIssue]:
     """Проверяет файл на проблемы безопасности.
 
     Args:
         file_path: Абсолютный путь к файлу.
         base_path: Базовый путь проекта (для rel_path в результатах).
+        cache: Общий кэш содержимого/AST на время анализа (файл читается один раз).
 
     Returns:
-        Список SecurityIssue. Пустой для документации/тестов или при ошибке чтения.
+        Список SecurityIssue (не более MAX_ISSUES_PER_FILE, первые по строкам).
+        Пустой для документации/тестов или при ошибке чтения.
 
     """
     issues: list[SecurityIssue] = []
@@ -81,28 +111,80 @@ def check_file_security(file_path: Path, base_path: Path) -> list[SecurityIssue]
     if any(part in path_lower for part in ["test", "tests", "spec", "__tests__"]) and file_path.suffix == ".py":
         return issues
 
-    try:
-        content = file_path.read_text(encoding="utf-8", errors="replace")
-    except OSError as e:
-        logger.debug("Failed to read %s: %s", rel_path, e)
+    parsed = (cache or ParsedFileCache()).get(file_path)
+    if parsed is None:
+        logger.debug("Failed to read %s", rel_path)
         return issues
 
-    lines = content.split("\n")
-    for i, line in enumerate(lines, 1):
-        stripped = line.strip()
-        if stripped.startswith(("#", "//")):
-            continue
-        if stripped.startswith('"""') or stripped.startswith("'''"):
-            continue
-        for compiled_pattern, severity, issue, recommendation in _COMPILED_PATTERNS:
-            if compiled_pattern.search(line):
-                issues.append(
-                    SecurityIssue(
-                        severity=severity,
-                        file=rel_path,
-                        line=i,
-                        issue=issue,
-                        recommendation=recommendation,
-                    )
-                )
+    for line_no, index in _find_pattern_lines(parsed.content):
+        _, severity, issue, recommendation = _COMPILED_PATTERNS[index]
+        issues.append(
+            SecurityIssue(
+                severity=severity,
+                file=rel_path,
+                line=line_no,
+                issue=issue,
+                recommendation=recommendation,
+            )
+        )
     return issues
+
+
+def _line_end(content: str, line_start: int) -> int:
+    """Позиция конца строки, начинающейся с line_start (перевод строки или конец текста)."""
+    end = content.find("\n", line_start)
+    return len(content) if end == -1 else end
+
+
+def _is_skipped_line(line: str) -> bool:
+    """Комментарий или строка, начинающаяся с тройных кавычек, — не проверяется."""
+    stripped = line.strip()
+    return stripped.startswith(("#", "//", '"""', "'''"))
+
+
+def _find_pattern_lines(content: str, limit: int = MAX_ISSUES_PER_FILE) -> list[tuple[int, int]]:
+    """Первые limit пар (номер строки, индекс паттерна), отсортированные по строке и паттерну.
+
+    Каждый паттерн ищется по всему файлу одним finditer вместо цикла по строкам в Python;
+    паттерны, чьих ключевых подстрок нет в файле, пропускаются. Результат совпадает
+    с построчным поиском: совпадение, захватившее перевод строки, перепроверяется
+    построчно на каждой строке, которую оно затронуло. Скан паттерна прекращается
+    после limit засчитанных строк — дальнейшие не попадут в первые limit пар.
+    """
+    lowered = content.lower()
+    hits: set[tuple[int, int]] = set()
+    # начало строки -> строка пропускается (комментарий/докстринг)
+    skipped: dict[int, bool] = {}
+
+    def accept(line_no: int, line_start: int, index: int) -> bool:
+        if line_start not in skipped:
+            skipped[line_start] = _is_skipped_line(content[line_start : _line_end(content, line_start)])
+        if skipped[line_start] or (line_no, index) in hits:
+            return False
+        hits.add((line_no, index))
+        return True
+
+    for index, (compiled_pattern, *_) in enumerate(_COMPILED_PATTERNS):
+        if not any(keyword in lowered for keyword in _SCREEN_KEYWORDS[index]):
+            continue
+        accepted = 0
+        # Совпадения идут по возрастанию позиции: переводы строк считаются от предыдущего
+        counted_to, lines_before = 0, 0
+        for match in compiled_pattern.finditer(content):
+            if accepted >= limit:
+                break
+            line_start = content.rfind("\n", 0, match.start()) + 1
+            lines_before += content.count("\n", counted_to, line_start)
+            counted_to = line_start
+            line_no = lines_before + 1
+            if "\n" not in match.group():
+                accepted += accept(line_no, line_start, index)
+                continue
+            while line_start <= match.end():
+                line_end = _line_end(content, line_start)
+                if compiled_pattern.search(content, line_start, line_end):
+                    accepted += accept(line_no, line_start, index)
+                line_start = line_end + 1
+                line_no += 1
+
+    return sorted(hits)[:limit]
@@ -19,7 +19,7 @@ from src.domain.ports.config import RAGConfig
 from src.domain.ports.embeddings import EmbeddingsPort
 from src.domain.ports.rag import Chunk
 from src.infrastructure.agents.project_mapper import (
-    build_project_map,
+    build_project_map_async,
     load_project_map,
     save_project_map,
 )
@@ -39,9 +39,15 @@ class ChromaDBRAGAdapter:
         self,
         config: RAGConfig,
         embeddings: EmbeddingsPort,
+        output_dir: str = "output",
     ) -> None:
-        """Initialize with RAG config and embeddings port."""
+        """Initialize with RAG config and embeddings port.
+
+        output_dir holds the project map and its per-file analysis cache
+        (the configured persistence output directory).
+        """
         self._config = config
+        self._output_dir = output_dir
         self._embeddings = embeddings
         chromadb_path = Path(config.chromadb_path).resolve()
         chromadb_path.mkdir(parents=True, exist_ok=True)
@@ -247,8 +253,8 @@ class ChromaDBRAGAdapter:
             if generate_map and files_with_stats:
                 files_for_map = [(r, c) for r, c, _, _ in files_with_stats]
                 try:
-                    project_map = build_project_map(base, files_for_map)
-                    map_path = save_project_map(project_map)
+                    project_map = await build_project_map_async(base, files_for_map, cache_dir=self._output_dir)
+                    map_path = save_project_map(project_map, self._output_dir)
                     stats["project_map"] = str(map_path)
                     stats["project_stats"] = project_map.stats
                 except Exception as e:
@@ -263,8 +269,8 @@ class ChromaDBRAGAdapter:
         if generate_map:
             files_for_map = [(r, c) for r, c, _, _ in files_with_stats]
             try:
-                project_map = build_project_map(base, files_for_map)
-                map_path = save_project_map(project_map)
+                project_map = await build_project_map_async(base, files_for_map, cache_dir=self._output_dir)
+                map_path = save_project_map(project_map, self._output_dir)
                 stats["project_map"] = str(map_path)
                 stats["project_stats"] = project_map.stats
             except Exception as e:
@@ -369,7 +375,7 @@ class ChromaDBRAGAdapter:
 
     def get_project_map_markdown(self) -> str | None:
         """Get project map as markdown."""
-        project_map = load_project_map()
+        project_map = load_project_map(self._output_dir)
         if project_map:
             return project_map.to_markdown()
         return None
@@ -11,6 +11,14 @@ Production-ready with:
 import re
 from dataclasses import dataclass
 
+# Комментарии и строковые литералы, вырезаемые перед проверкой (компилируются один раз)
+_COMMENT_RE = re.compile(r"#.*$", re.MULTILINE)
+_TRIPLE_DOUBLE_RE = re.compile(r'""".*?"""', re.DOTALL)
+_TRIPLE_SINGLE_RE = re.compile(r"'''.*?'''", re.DOTALL)
+_DOUBLE_QUOTED_RE = re.compile(r'"[^"\\]*(?:\\.[^"\\]*)*"')
+_SINGLE_QUOTED_RE = re.compile(r"'[^'\\]*(?:\\.[^'\\]*)*'")
+_OPEN_CALL_RE = re.compile(r"\bopen\s*\(")
+
 
 @dataclass
 class SecurityCheckResult:
@@ -78,6 +86,11 @@ class CodeSecurityChecker:
         r"\bos\.unlink\s*\(",
     ]
 
+    # Скомпилированные паттерны — общие для всех экземпляров, строятся при загрузке класса
+    _import_patterns = [(re.compile(p, re.MULTILINE), p) for p in DANGEROUS_IMPORT_PATTERNS]
+    _function_patterns = [(re.compile(p), p) for p in DANGEROUS_FUNCTION_PATTERNS]
+    _call_patterns = [(re.compile(p), p) for p in DANGEROUS_CALL_PATTERNS]
+
     def __init__(
         self,
         strict_mode: bool = False,
@@ -93,21 +106,16 @@ class CodeSecurityChecker:
         self.strict_mode = strict_mode
         self.allow_file_ops = allow_file_ops
 
-        # Pre-compile regex patterns
-        self._import_patterns = [(re.compile(p, re.MULTILINE), p) for p in self.DANGEROUS_IMPORT_PATTERNS]
-        self._function_patterns = [(re.compile(p), p) for p in self.DANGEROUS_FUNCTION_PATTERNS]
-        self._call_patterns = [(re.compile(p), p) for p in self.DANGEROUS_CALL_PATTERNS]
-
     def _remove_comments_and_strings(self, code: str) -> str:
         """Remove comments and string literals to reduce false positives."""
         # Remove single-line comments
-        code = re.sub(r"#.*$", "", code, flags=re.MULTILINE)
+        code = _COMMENT_RE.sub("", code)
         # Remove triple-quoted strings (docstrings)
-        code = re.sub(r'""".*?"""', '""', code, flags=re.DOTALL)
-        code = re.sub(r"'''.*?'''", "''", code, flags=re.DOTALL)
+        code = _TRIPLE_DOUBLE_RE.sub('""', code)
+        code = _TRIPLE_SINGLE_RE.sub("''", code)
         # Remove regular strings (simplified - may have edge cases)
-        code = re.sub(r'"[^"\\]*(?:\\.[^"\\]*)*"', '""', code)
-        code = re.sub(r"'[^'\\]*(?:\\.[^'\\]*)*'", "''", code)
+        code = _DOUBLE_QUOTED_RE.sub('""', code)
+        code = _SINGLE_QUOTED_RE.sub("''", code)
         return code
 
     def check(self, code: str) -> SecurityCheckResult:
@@ -165,7 +173,7 @@ class CodeSecurityChecker:
 
         # Проверяем файловые операции (если запрещены)
         if not self.allow_file_ops:
-            if re.search(r"\bopen\s*\(", clean_code):
+            if _OPEN_CALL_RE.search(clean_code):
                 warnings.append("File operation detected: open()")
 
         is_safe = len(blocked) == 0
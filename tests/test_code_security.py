@@ -108,6 +108,18 @@ print('hello')
         assert "import json" in sanitized
         assert "print('hello')" in sanitized
 
+    def test_comments_strings_and_file_ops(self):
+        """Matches inside comments/strings are ignored; open() is flagged only when file ops are disallowed."""
+        code = "# eval(x)\ntext = 'exec(y)'\ndoc = \"\"\"os.system('ls')\"\"\"\nopen('f')\n"
+        assert CodeSecurityChecker().check(code).warnings == []
+        result = CodeSecurityChecker(allow_file_ops=False).check(code)
+        assert result.warnings == ["File operation detected: open()"]
+        assert result.blocked == []
+
+    def test_patterns_compiled_once(self):
+        """Compiled patterns are shared by all instances."""
+        assert CodeSecurityChecker()._call_patterns is CodeSecurityChecker()._call_patterns
+
     def test_get_security_checker_from_container(self):
         """get_security_checker (from dependencies) should return container instance."""
         checker = get_security_checker()
@@ -1,16 +1,23 @@
 """Tests for Project Analyzer."""
 
+import pickle
 import tempfile
 from pathlib import Path
+from unittest.mock import patch
+
+import pytest
 
 from src.api.container import reset_container
 from src.api.dependencies import get_analyzer
 from src.infrastructure.analyzer import (
     FileMetrics,
+    ProjectAnalysis,
     ProjectAnalyzer,
     ReportGenerator,
     SecurityIssue,
 )
+from src.infrastructure.analyzer.project_analyzer import _summarize_metrics
+from src.infrastructure.analyzer.report_generator import escape_markdown
 
 
 class TestProjectAnalyzer:
@@ -130,6 +137,111 @@ global x  # Global
             assert "JavaScript" in analysis.languages
             assert "CSS" in analysis.languages
 
+    def test_process_pool_matches_thread_pool(self, monkeypatch):
+        """Large projects analyzed in worker processes give the same result as threads."""
+        import src.infrastructure.analyzer.project_analyzer as pa
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            (Path(tmpdir) / "pkg").mkdir()
+            for i in range(6):
+                (Path(tmpdir) / "pkg" / f"m{i}.py").write_text(
+                    f"import pkg.m{(i + 1) % 6}\nfrom x import *\n\ndef f{i}():\n    eval('1')\n"
+                )
+
+            threaded = ProjectAnalyzer().analyze(tmpdir)
+            monkeypatch.setattr(pa, "PROCESS_POOL_MIN_FILES", 1)
+            monkeypatch.setattr(pa.os, "cpu_count", lambda: 2)
+            processed = ProjectAnalyzer().analyze(tmpdir)
+
+            assert processed.file_metrics == threaded.file_metrics
+            assert processed.security_issues == threaded.security_issues
+            assert processed.code_smells == threaded.code_smells
+            assert processed.architecture.dependencies == threaded.architecture.dependencies
+            assert len(processed.code_smells) == 6
+
+    def test_max_workers_one_stays_in_process(self, monkeypatch):
+        """max_workers=1 never starts a process pool, even for large projects."""
+        import src.infrastructure.analyzer.project_analyzer as pa
+
+        def no_processes(*args, **kwargs):
+            raise AssertionError("process pool must not be used")
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            for i in range(3):
+                (Path(tmpdir) / f"m{i}.py").write_text(f"def f{i}():\n    pass\n")
+            monkeypatch.setattr(pa, "PROCESS_POOL_MIN_FILES", 1)
+            monkeypatch.setattr(pa, "ProcessPoolExecutor", no_processes)
+            analysis = ProjectAnalyzer(max_workers=1).analyze(tmpdir)
+
+            assert analysis.total_files == 3
+
+    def test_thread_count_follows_file_count(self, monkeypatch):
+        """Tiny projects run without a pool; larger ones get about one thread per 8 files."""
+        import src.infrastructure.analyzer.project_analyzer as pa
+
+        sizes: list[int] = []
+        real_executor = pa.ThreadPoolExecutor
+
+        def tracking_executor(max_workers=None):
+            sizes.append(max_workers)
+            return real_executor(max_workers=max_workers)
+
+        monkeypatch.setattr(pa, "ThreadPoolExecutor", tracking_executor)
+        with tempfile.TemporaryDirectory() as tmpdir:
+            for i in range(3):
+                (Path(tmpdir) / f"m{i}.py").write_text("x = 1\n")
+            assert ProjectAnalyzer().analyze(tmpdir).total_files == 3
+            assert sizes == []
+
+            for i in range(3, 24):
+                (Path(tmpdir) / f"m{i}.py").write_text("x = 1\n")
+            assert ProjectAnalyzer().analyze(tmpdir).total_files == 24
+            assert sizes == [3]
+
+    def test_invalid_max_workers(self):
+        """Non-positive max_workers is rejected."""
+        with pytest.raises(ValueError, match="max_workers"):
+            ProjectAnalyzer(max_workers=0)
+
+    def test_security_score_and_recommendations_by_severity(self):
+        """Score deducts per severity with caps; recommendations count critical/high issues."""
+        severities = ["critical"] * 2 + ["high"] + ["medium"] * 4 + ["low"] * 10
+        issues = [SecurityIssue(severity=s, file="a.py", line=1, issue="x", recommendation="y") for s in severities]
+        analyzer = ProjectAnalyzer()
+        assert analyzer._calculate_security_score(issues) == 72
+        assert analyzer._calculate_security_score(issues * 10) == 5
+
+        analysis = ProjectAnalysis(project_path="/p", project_name="p", analyzed_at="now", security_issues=issues)
+        recs = analyzer._generate_recommendations(analysis)
+        assert recs[0].startswith("🔴 КРИТИЧНО: Исправить 2 ")
+        assert recs[1].startswith("🟠 ВЫСОКИЙ: Устранить 1 ")
+
+    def test_metrics_summary_single_pass(self):
+        """Scores and recommendations use one summary of file_metrics."""
+        analysis = ProjectAnalysis(project_path="/p", project_name="p", analyzed_at="now", total_code_lines=1200)
+        analysis.file_metrics = [
+            FileMetrics(path="big.py", lines_code=600, complexity=25, lines_comment=30),
+            FileMetrics(path="tests/test_big.py", lines_code=600, complexity=5, lines_comment=10),
+            FileMetrics(path="util.py", lines_code=0, complexity=0),
+        ]
+        summary = _summarize_metrics(analysis.file_metrics)
+        assert (summary.large_files, summary.complex_files, summary.total_comments) == (2, 1, 40)
+        assert summary.has_tests and not summary.has_docs
+        assert summary.avg_complexity == 10
+
+        analyzer = ProjectAnalyzer()
+        with patch("src.infrastructure.analyzer.project_analyzer._summarize_metrics") as summarize:
+            score = analyzer._calculate_quality_score(analysis, summary)
+            recs = analyzer._generate_recommendations(analysis, summary)
+            weaknesses = analyzer._identify_weaknesses(analysis, summary)
+        summarize.assert_not_called()
+        assert score == analyzer._calculate_quality_score(analysis)
+        assert recs == analyzer._generate_recommendations(analysis)
+        assert "⚠️ 2 файлов слишком большие" in weaknesses
+
+        analysis.file_metrics.append(FileMetrics(path="docs/intro.mdx"))
+        assert _summarize_metrics(analysis.file_metrics).has_docs
+
     def test_ignores_excluded_directories(self):
         """Should ignore .venv, node_modules, etc."""
         with tempfile.TemporaryDirectory() as tmpdir:
@@ -252,6 +364,27 @@ class TestReportGenerator:
             # Should not crash
             assert "Отчёт анализа проекта" in report
 
+    def test_escape_markdown(self):
+        """Pipes and backticks are escaped; stars only next to text."""
+        assert escape_markdown("a|b `c`") == "a\\|b \\`c\\`"
+        assert escape_markdown("x * y") == "x * y"
+        assert escape_markdown("x*") == "x\\*"
+        assert escape_markdown(None) == ""
+
+    def test_top_files_order_and_ties(self):
+        """Top files: largest first, ties keep file order, at most five rows."""
+        analysis = ProjectAnalysis(project_path="/p", project_name="p", analyzed_at="now")
+        sizes = [10, 300, 50, 300, 5, 70, 200]
+        analysis.file_metrics = [
+            FileMetrics(path=f"f{i}.py", lines_code=n, complexity=n // 10) for i, n in enumerate(sizes)
+        ]
+        section = ReportGenerator()._top_files_section(analysis)
+        lines_part, complexity_part = section.split("сложности", 1)
+        order = [row.split("`")[1] for row in lines_part.splitlines() if row.startswith("| `")]
+        assert order == ["f1.py", "f3.py", "f6.py", "f5.py", "f2.py"]
+        by_complexity = [row.split("`")[1] for row in complexity_part.splitlines() if row.startswith("| `")]
+        assert by_complexity == ["f1.py", "f3.py", "f6.py", "f5.py", "f2.py"]
+
 
 class TestFileMetrics:
     """Tests for FileMetrics dataclass."""
@@ -267,6 +400,13 @@ class TestFileMetrics:
         assert metrics.imports == []
         assert metrics.issues == []
 
+    def test_file_metrics_slots_pickle(self):
+        """FileMetrics has no per-instance __dict__ and survives pickling (result cache, process pool)."""
+        metrics = FileMetrics(path="a.py", lines_code=3, imports=["os"])
+
+        assert not hasattr(metrics, "__dict__")
+        assert pickle.loads(pickle.dumps(metrics)) == metrics
+
 
 class TestSecurityIssue:
     """Tests for SecurityIssue dataclass."""
@@ -159,6 +159,27 @@ class TestResearcher:
         assert "relevant code" in result["context"]
         mock_rag.search.assert_called_once()
 
+    @pytest.mark.asyncio
+    async def test_researcher_groups_chunks_by_file(self, base_state):
+        """Chunks from the same source are joined under one file header."""
+        mock_rag = MagicMock(spec=["search"])
+        mock_rag.search = AsyncMock(
+            return_value=[
+                MagicMock(content="def a(): ...", metadata={"source": "a.py"}, score=0.9),
+                MagicMock(content="def b(): ...", metadata={"source": "b.py"}, score=0.8),
+                MagicMock(content="def a2(): ...", metadata={"source": "a.py"}, score=0.7),
+            ]
+        )
+        base_state["plan"] = "Write factorial"
+
+        result = await researcher_node(base_state, mock_rag)
+
+        assert result["context"] == (
+            "[RAG: 3 chunks from 2 files]\n\n"
+            "# File: a.py\n\ndef a(): ...\n\ndef a2(): ...\n\n---\n\n# File: b.py\n\ndef b(): ..."
+        )
+        assert result["project_map"] == ""
+
     @pytest.mark.asyncio
     async def test_researcher_without_rag(self, base_state):
         """Researcher handles no RAG gracefully."""
@@ -183,6 +204,102 @@ class TestValidator:
         assert result["current_step"] == "validation"
         assert result["validation_output"] is not None
 
+    @pytest.mark.asyncio
+    async def test_validator_reports_pass_and_fail(self, base_state):
+        """Passing tests set validation_passed, failing tests clear it."""
+        base_state["code"] = "def add(a, b):\n    return a + b\n"
+        base_state["tests"] = "from impl import add\n\ndef test_add():\n    assert add(2, 2) == 4\n"
+        result = await validator_node(base_state)
+        assert result["validation_passed"] is True, result["validation_output"]
+
+        base_state["tests"] = "from impl import add\n\ndef test_add():\n    assert add(2, 2) == 5\n"
+        result = await validator_node(base_state)
+        assert result["validation_passed"] is False
+
+    @pytest.mark.asyncio
+    async def test_validator_runs_async_tests(self, base_state):
+        """Async tests run with pytest-asyncio enabled explicitly."""
+        base_state["code"] = "async def one():\n    return 1\n"
+        base_state["tests"] = (
+            "import pytest\nfrom impl import one\n\n"
+            "@pytest.mark.asyncio\nasync def test_one():\n    assert await one() == 1\n"
+        )
+        result = await validator_node(base_state)
+        assert result["validation_passed"] is True, result["validation_output"]
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("warm", [True, False])
+    async def test_validator_loads_installed_plugins(self, base_state, monkeypatch, warm):
+        """Fixtures of installed pytest plugins other than pytest-asyncio are available (anyio ships with FastAPI)."""
+        from src.infrastructure.agents import validator
+
+        if not warm:
+            monkeypatch.setattr(validator, "_get_warm_context", lambda: None)
+        base_state["code"] = "def add(a, b):\n    return a + b\n"
+        base_state["tests"] = (
+            "from impl import add\n\ndef test_add(anyio_backend):\n"
+            "    assert anyio_backend\n    assert add(1, 1) == 2\n"
+        )
+        result = await validator_node(base_state)
+        assert result["validation_passed"] is True, result["validation_output"]
+
+    @pytest.mark.asyncio
+    async def test_validator_mocker_fixture(self, base_state):
+        """pytest-mock's mocker fixture works when the plugin is installed."""
+        pytest.importorskip("pytest_mock")
+        base_state["code"] = "import os\n\ndef cwd():\n    return os.getcwd()\n"
+        base_state["tests"] = (
+            "import impl\n\ndef test_cwd(mocker):\n"
+            "    mocker.patch('impl.os.getcwd', return_value='/x')\n    assert impl.cwd() == '/x'\n"
+        )
+        result = await validator_node(base_state)
+        assert result["validation_passed"] is True, result["validation_output"]
+
+    @pytest.mark.asyncio
+    async def test_validator_subprocess_fallback(self, base_state, monkeypatch):
+        """Without a forkserver, tests run in a fresh interpreter."""
+        from src.infrastructure.agents import validator
+
+        monkeypatch.setattr(validator, "_get_warm_context", lambda: None)
+        base_state["code"] = "def add(a, b):\n    return a + b\n"
+        base_state["tests"] = "from impl import add\n\ndef test_add():\n    assert add(2, 2) == 4\n"
+        result = await validator_node(base_state)
+        assert result["validation_passed"] is True, result["validation_output"]
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("warm", [True, False])
+    async def test_validator_tests_may_start_processes(self, base_state, monkeypatch, warm):
+        """Generated tests that start a multiprocessing child pass on both the forkserver and subprocess paths."""
+        from src.infrastructure.agents import validator
+
+        if not warm:
+            monkeypatch.setattr(validator, "_get_warm_context", lambda: None)
+        base_state["code"] = (
+            "import multiprocessing\n\n"
+            "def _square(q, x):\n    q.put(x * x)\n\n"
+            "def square_in_child(x):\n"
+            "    q = multiprocessing.Queue()\n"
+            "    p = multiprocessing.Process(target=_square, args=(q, x))\n"
+            "    p.start()\n    result = q.get(timeout=10)\n    p.join()\n    return result\n"
+        )
+        base_state["tests"] = (
+            "from impl import square_in_child\n\ndef test_child():\n    assert square_in_child(3) == 9\n"
+        )
+        result = await validator_node(base_state)
+        assert result["validation_passed"] is True, result["validation_output"]
+
+    @pytest.mark.asyncio
+    async def test_validator_timeout_kills_worker(self, base_state, monkeypatch):
+        """A hanging test is killed after the timeout."""
+        from src.infrastructure.agents import validator
+
+        monkeypatch.setattr(validator, "VALIDATION_TIMEOUT", 1)
+        base_state["code"] = "def hang():\n    while True:\n        pass\n"
+        base_state["tests"] = "from impl import hang\n\ndef test_hang():\n    hang()\n"
+        result = await validator_node(base_state)
+        assert result["validation_passed"] is False
+        assert "timeout" in result["validation_output"].lower()
+
     @pytest.mark.asyncio
     async def test_validator_empty_code(self, base_state):
         """Validator handles empty code."""
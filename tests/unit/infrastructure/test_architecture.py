@@ -2,7 +2,7 @@
 
 from pathlib import Path
 
-from src.infrastructure.analyzer.architecture import analyze_architecture
+from src.infrastructure.analyzer.architecture import CONFIG_PATTERNS, analyze_architecture
 
 
 class TestAnalyzeArchitecture:
@@ -54,6 +54,13 @@ class TestAnalyzeArchitecture:
         assert any("pyproject.toml" in c for c in arch.config_files)
         assert any("config.yaml" in c for c in arch.config_files)
 
+    def test_config_matching_same_as_glob_patterns(self, tmp_path: Path):
+        names = [".env", ".env.local", "prod.env", "a.toml", ".toml", "x.JSON", "cfg.json.bak", "settings.ini"]
+        files = [tmp_path / n for n in names]
+        arch = analyze_architecture(tmp_path, files)
+        expected = [n for n in names if any((tmp_path / n).match(p) for p in CONFIG_PATTERNS)]
+        assert arch.config_files == expected
+
     def test_detects_dependencies(self, tmp_path: Path):
         f = tmp_path / "src" / "app.py"
         f.parent.mkdir(parents=True)
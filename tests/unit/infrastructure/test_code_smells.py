@@ -1,12 +1,13 @@
-"""Tests for code_smells — pattern detection with tmp_path, zero mocks."""
+"""Tests for code_smells — smell detection with tmp_path, zero mocks."""
 
 from pathlib import Path
 
 from src.infrastructure.analyzer.code_smells import MAX_SMELLS, find_code_smells
+from src.infrastructure.analyzer.parsed_file import ParsedFileCache
 
 
 class TestFindCodeSmells:
-    """find_code_smells: regex pattern detection in Python files."""
+    """find_code_smells: AST-based smell detection in Python files."""
 
     def test_no_files(self, tmp_path: Path):
         assert find_code_smells([], tmp_path) == []
@@ -82,6 +83,52 @@ class TestFindCodeSmells:
         result = find_code_smells([f], tmp_path)
         assert any("2 occurrences" in s for s in result)
 
+    def test_smell_text_in_comments_and_strings_ignored(self, tmp_path: Path):
+        """Structural smells come from the AST, so comments and strings do not count."""
+        f = tmp_path / "overlap.py"
+        f.write_text('x = "from os import *"  # except: global y  type: ignore\n')
+        result = find_code_smells([f], tmp_path)
+        assert result == ["overlap.py: Комментарий type: ignore (1 occurrences)"]
+
+    def test_long_params_counts_parameters(self, tmp_path: Path):
+        """Six short parameters are a smell; five long-named ones are not."""
+        f = tmp_path / "params.py"
+        long_names = ", ".join(f"a_very_long_parameter_name_{i}" for i in range(5))
+        f.write_text(f"def ok({long_names}):\n    pass\n\ndef bad(a, b, c, d, e, *, f):\n    pass\n")
+        result = find_code_smells([f], tmp_path)
+        assert result == ["params.py: Длинный список параметров (>5) (1 occurrences)"]
+
+    def test_nesting_mixed_blocks_counted_once_per_block(self, tmp_path: Path):
+        """for/with/if nest; each block reaching the third level is one occurrence."""
+        f = tmp_path / "nested.py"
+        f.write_text(
+            "for i in range(3):\n"
+            "    with open('f') as fh:\n"
+            "        if i:\n"
+            "            while i:\n"
+            "                i -= 1\n"
+            "        if not i:\n"
+            "            pass\n"
+        )
+        result = find_code_smells([f], tmp_path)
+        assert result == ["nested.py: Глубокая вложенность (3+ уровня) (2 occurrences)"]
+
+    def test_elif_chain_is_not_nesting(self, tmp_path: Path):
+        f = tmp_path / "chain.py"
+        f.write_text("if a:\n    pass\nelif b:\n    pass\nelif c:\n    pass\nelif d:\n    pass\n")
+        assert find_code_smells([f], tmp_path) == []
+
+    def test_function_resets_nesting(self, tmp_path: Path):
+        f = tmp_path / "scoped.py"
+        f.write_text("if a:\n    if b:\n        def inner():\n            if c:\n                pass\n")
+        assert find_code_smells([f], tmp_path) == []
+
+    def test_syntax_error_reports_only_comments(self, tmp_path: Path):
+        f = tmp_path / "broken.py"
+        f.write_text("from os import *\ndef (:  # type: ignore\n")
+        result = find_code_smells([f], tmp_path)
+        assert result == ["broken.py: Комментарий type: ignore (1 occurrences)"]
+
     def test_max_smells_limit(self, tmp_path: Path):
         # Create many files each with a smell
         files = []
@@ -92,6 +139,24 @@ class TestFindCodeSmells:
         result = find_code_smells(files, tmp_path)
         assert len(result) <= MAX_SMELLS
 
+    def test_stops_reading_after_limit(self, tmp_path: Path):
+        """Files after the limit is reached are not read."""
+        files = []
+        for i in range(MAX_SMELLS + 5):
+            f = tmp_path / f"file_{i:02d}.py"
+            f.write_text("from os import *\n")
+            files.append(f)
+        read: list[str] = []
+
+        class RecordingCache(ParsedFileCache):
+            def get(self, file_path: Path):
+                read.append(file_path.name)
+                return super().get(file_path)
+
+        result = find_code_smells(files, tmp_path, RecordingCache())
+        assert len(result) == MAX_SMELLS
+        assert read == [f.name for f in files[:MAX_SMELLS]]
+
     def test_unreadable_file_skipped(self, tmp_path: Path):
         good = tmp_path / "good.py"
         good.write_text("from os import *\n")
@@ -1,7 +1,9 @@
 """Tests for coverage_collector (A4)."""
 
+import subprocess
 import tempfile
 from pathlib import Path
+from unittest.mock import patch
 
 from src.infrastructure.analyzer.coverage_collector import collect_coverage_for_analysis
 
@@ -28,3 +30,15 @@ class TestCollectCoverageForAnalysis:
             result = collect_coverage_for_analysis(tmpdir)
         assert "Покрытие не измерено" in result
         assert "tests" in result.lower()
+
+    def test_single_process_run_reports_coverage(self, tmp_path: Path):
+        """Tests and report run in one child interpreter; report lists project modules."""
+        (tmp_path / "pyproject.toml").write_text("[project]\nname = 'x'")
+        (tmp_path / "mod.py").write_text("def f(x):\n    if x:\n        return 1\n    return 2\n")
+        (tmp_path / "tests").mkdir()
+        (tmp_path / "tests" / "test_mod.py").write_text("from mod import f\n\ndef test_f():\n    assert f(1) == 1\n")
+        with patch("src.infrastructure.analyzer.coverage_collector.subprocess.run", wraps=subprocess.run) as run:
+            result = collect_coverage_for_analysis(str(tmp_path))
+        assert run.call_count == 1
+        assert "mod.py" in result
+        assert "exit code pytest: 0" in result
@@ -4,6 +4,9 @@ import tempfile
 from pathlib import Path
 
 from src.infrastructure.analyzer.dependency_graph import (
+    _extract_ts_imports,
+    _find_cycles,
+    _resolve_python_import,
     build_dependency_graph,
     format_dependency_graph_markdown,
 )
@@ -43,6 +46,16 @@ class TestBuildDependencyGraph:
         assert "a.py" in from_files
         assert "b.py" in to_files
 
+    def test_repeated_imports_give_one_edge(self):
+        """Several imports of the same file collapse into one edge labelled by the first."""
+        with tempfile.TemporaryDirectory() as d:
+            path = Path(d)
+            (path / "b.py").write_text("x = 1\ny = 2\n")
+            (path / "a.py").write_text("import b\nfrom b import x\nfrom b import y\n")
+            result = build_dependency_graph(d)
+        assert result.edge_count == 1
+        assert [(e.from_file, e.to_file, e.name) for e in result.edges] == [("a.py", "b.py", "b")]
+
     def test_cycle_detection(self):
         """Cycle: a -> b -> a."""
         with tempfile.TemporaryDirectory() as d:
@@ -55,6 +68,16 @@ class TestBuildDependencyGraph:
         assert "a.py" in flat
         assert "b.py" in flat
 
+    def test_unused_imports(self):
+        """Imports used only via attribute chains count as used; unread names are reported."""
+        with tempfile.TemporaryDirectory() as d:
+            path = Path(d)
+            (path / "m.py").write_text(
+                "import os\nimport json\nfrom typing import Any, List\n\nx: Any = os.path.join('a', 'b')\n"
+            )
+            result = build_dependency_graph(d)
+        assert sorted(result.unused_imports) == [("m.py", "List"), ("m.py", "json")]
+
     def test_invalid_path_returns_empty(self):
         """Non-existent path returns empty result."""
         result = build_dependency_graph("/nonexistent/path/12345")
@@ -62,6 +85,110 @@ class TestBuildDependencyGraph:
         assert result.edge_count == 0
 
 
+class TestExtractTsImports:
+    """Tests for _extract_ts_imports."""
+
+    def test_import_and_require_forms(self):
+        """Default, named, namespace, side-effect imports and require() are found."""
+        content = (
+            "import React from 'react';\n"
+            'import { a, b } from "./util";\n'
+            "import * as ns from './ns';\n"
+            "import './side-effect';\n"
+            "const fs = require('fs');\n"
+            "import legacy = require('./legacy');\n"
+        )
+        assert _extract_ts_imports(content) == ["react", "./util", "./ns", "./side-effect", "fs", "./legacy"]
+
+    def test_type_default_named_dynamic_and_reexports(self):
+        """import type, default+named, multi-line, import(), export-from forms are found."""
+        content = (
+            "import type { Props } from './types';\n"
+            "import React, { useState } from 'react';\n"
+            "import {\n  a, // first\n  b,\n} from './multi';\n"
+            "const Page = lazy(() => import('./Page'));\n"
+            "const mod = await import(`./tpl`);\n"
+            "export { x } from './x';\n"
+            "export * from './all';\n"
+            "export * as ns from './ns';\n"
+        )
+        assert _extract_ts_imports(content) == [
+            "./types",
+            "react",
+            "./multi",
+            "./Page",
+            "./tpl",
+            "./x",
+            "./all",
+            "./ns",
+        ]
+
+    def test_keyword_suffix_of_identifier_ignored(self):
+        """reimport(), obj.import(), myrequire() and reexport are not import statements."""
+        content = (
+            "reimport('./a');\n"
+            "loader.import('./b');\n"
+            "myrequire('./c');\n"
+            "$require('./d');\n"
+            "reexport * from './e';\n"
+            "x = 1;import('./ok');\n"
+        )
+        assert _extract_ts_imports(content) == ["./ok"]
+
+
+class TestResolvePythonImport:
+    """Tests for _resolve_python_import (posix paths relative to the project root)."""
+
+    FILES = {"src/__init__.py", "src/api/__init__.py", "src/api/routes.py", "tools/helper.py", "tools/cli.py"}
+
+    def test_module_file_from_root(self):
+        """Dotted module resolves to module.py from the root."""
+        assert _resolve_python_import("src.api.routes", "", self.FILES) == "src/api/routes.py"
+
+    def test_package_init(self):
+        """Package import resolves to its __init__.py."""
+        assert _resolve_python_import("src.api", "tools", self.FILES) == "src/api/__init__.py"
+
+    def test_local_sibling_module(self):
+        """Module next to the importing file resolves from its directory."""
+        assert _resolve_python_import("helper", "tools", self.FILES) == "tools/helper.py"
+
+    def test_unresolved(self):
+        """Third-party module is not resolved."""
+        assert _resolve_python_import("requests", "tools", self.FILES) is None
+
+
+class TestFindCycles:
+    """Tests for _find_cycles (iterative Tarjan SCC)."""
+
+    def test_one_cycle_per_component(self):
+        """A component reachable from several entry points is reported once."""
+        adj = {"a": ["b"], "b": ["a", "c"], "c": ["b"], "x": ["a"]}
+        cycles = _find_cycles(adj)
+        assert len(cycles) == 1
+        assert cycles[0][0] == cycles[0][-1] == "a"
+
+    def test_cycle_path_follows_edges(self):
+        """Returned cycle is a real path in the graph."""
+        adj = {"a": ["b"], "b": ["c"], "c": ["a"]}
+        (cycle,) = _find_cycles(adj)
+        assert cycle == ["a", "b", "c", "a"]
+        assert all(dst in adj[src] for src, dst in zip(cycle, cycle[1:]))
+
+    def test_acyclic_and_self_loop(self):
+        """DAG has no cycles; a self-loop is a cycle of one node."""
+        assert _find_cycles({"a": ["b"], "b": ["c"]}) == []
+        assert _find_cycles({"a": ["a"]}) == [["a", "a"]]
+
+    def test_deep_chain_no_recursion_error(self):
+        """Import chains longer than the recursion limit are handled."""
+        n = 20000
+        adj = {str(i): [str(i + 1)] for i in range(n)}
+        adj[str(n)] = ["0"]
+        (cycle,) = _find_cycles(adj)
+        assert len(cycle) == n + 2
+
+
 class TestFormatDependencyGraphMarkdown:
     """Tests for format_dependency_graph_markdown."""
 
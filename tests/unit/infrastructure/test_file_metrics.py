@@ -4,6 +4,7 @@ import ast
 from pathlib import Path
 
 from src.infrastructure.analyzer.file_metrics import (
+    _summarize_tree,
     compute_file_metrics,
     estimate_complexity,
     extract_imports,
@@ -52,6 +53,28 @@ class Bar:
         assert m.classes == 0
         assert m.imports == []
 
+    def test_python_line_classification(self, tmp_path: Path):
+        """Docstrings count as comments; multi-line string values count as code."""
+        code = '"""Module doc.\n\nMore."""\n# comment\n\nSQL = """\nSELECT 1\n"""\nx = (10\n     // 3)\n'
+        (tmp_path / "m.py").write_text(code)
+        m = compute_file_metrics(tmp_path / "m.py", tmp_path)
+        assert m.lines_total == 11
+        assert m.lines_blank == 3  # blank docstring line, blank line, trailing ""
+        assert m.lines_comment == 3  # two non-blank docstring lines, "# comment"
+        assert m.lines_code == 5
+
+    def test_js_comment_lines(self, tmp_path: Path):
+        """Non-Python files count # and // lines as comments."""
+        (tmp_path / "a.js").write_text("// header\nconst a = 1;\n  // note\n")
+        m = compute_file_metrics(tmp_path / "a.js", tmp_path)
+        assert (m.lines_total, m.lines_comment, m.lines_blank, m.lines_code) == (4, 2, 1, 1)
+
+    def test_whitespace_only_lines_are_blank(self, tmp_path: Path):
+        """Lines of spaces/tabs count as blank; indented comments count as comments."""
+        (tmp_path / "w.py").write_text("x = 1\n \t \n\t# note\n")
+        m = compute_file_metrics(tmp_path / "w.py", tmp_path)
+        assert (m.lines_total, m.lines_blank, m.lines_comment, m.lines_code) == (4, 2, 1, 1)
+
     def test_syntax_error_adds_issue(self, tmp_path: Path):
         """Python file with syntax error adds issue."""
         (tmp_path / "bad.py").write_text("def ( invalid\n")
@@ -85,3 +108,22 @@ class TestEstimateComplexity:
         """If statement adds to cyclomatic complexity."""
         tree = ast.parse("if x:\n    pass")
         assert estimate_complexity(tree) >= 2
+
+
+class TestSummarizeTree:
+    """_summarize_tree matches the standalone passes it replaces."""
+
+    def test_matches_extract_imports_and_complexity(self):
+        """Single pass gives the same imports/complexity as the separate helpers."""
+        tree = ast.parse(
+            "import os, sys\nfrom a.b import c\n\n"
+            "class K:\n    '''Doc.'''\n\n    def m(self, x):\n"
+            "        if x and self or not x:\n            return [i for i in x if i]\n"
+            "        while x:\n            x -= 1\n"
+            "        try:\n            pass\n        except ValueError:\n            pass\n"
+        )
+        functions, classes, imports, complexity, strings = _summarize_tree(tree)
+        assert (functions, classes) == (1, 1)
+        assert imports == extract_imports(tree)
+        assert complexity == estimate_complexity(tree)
+        assert strings == [(5, 5)]
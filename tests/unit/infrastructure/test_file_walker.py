@@ -0,0 +1,167 @@
+"""Tests for file_walker (scandir-based project walk with directory pruning)."""
+
+import os
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from src.infrastructure.analyzer.dependency_graph import _collect_code_files
+from src.infrastructure.analyzer.file_walker import is_generated_file, iter_project_files
+from src.infrastructure.analyzer.project_analyzer import ProjectAnalyzer
+
+
+def _names(root: Path, ignore: set[str]) -> set[str]:
+    return {str(Path(e.path).relative_to(root)) for e in iter_project_files(root, ignore)}
+
+
+class TestIterProjectFiles:
+    """iter_project_files: walk files, prune ignored directories."""
+
+    def test_walks_nested_files(self, tmp_path: Path):
+        (tmp_path / "a" / "b").mkdir(parents=True)
+        (tmp_path / "top.py").write_text("")
+        (tmp_path / "a" / "b" / "deep.py").write_text("")
+        assert _names(tmp_path, set()) == {"top.py", os.path.join("a", "b", "deep.py")}
+
+    def test_ignored_dirs_not_entered(self, tmp_path: Path):
+        (tmp_path / "node_modules" / "pkg").mkdir(parents=True)
+        (tmp_path / "node_modules" / "pkg" / "index.js").write_text("")
+        (tmp_path / "app.js").write_text("")
+        scanned: list[str] = []
+        real_scandir = os.scandir
+
+        def tracking_scandir(path):
+            scanned.append(str(path))
+            return real_scandir(path)
+
+        with patch("src.infrastructure.analyzer.file_walker.os.scandir", side_effect=tracking_scandir):
+            assert _names(tmp_path, {"node_modules"}) == {"app.js"}
+        assert not any("node_modules" in p for p in scanned)
+
+    def test_root_inside_ignored_name_still_walked(self, tmp_path: Path):
+        """Only directories below the root are pruned, not the root's own ancestors."""
+        root = tmp_path / "build" / "proj"
+        root.mkdir(parents=True)
+        (root / "main.py").write_text("")
+        assert _names(root, {"build"}) == {"main.py"}
+
+    def test_symlinked_dir_not_followed(self, tmp_path: Path):
+        (tmp_path / "real").mkdir()
+        (tmp_path / "real" / "x.py").write_text("")
+        (tmp_path / "link").symlink_to(tmp_path / "real", target_is_directory=True)
+        assert _names(tmp_path, set()) == {os.path.join("real", "x.py")}
+
+    def test_missing_root_yields_nothing(self, tmp_path: Path):
+        assert _names(tmp_path / "missing", set()) == set()
+
+    def test_strict_root_raises_only_for_root(self, tmp_path: Path):
+        """strict_root surfaces an unreadable root; unreadable subdirectories are still skipped."""
+        (tmp_path / "locked").mkdir()
+        (tmp_path / "a.py").write_text("")
+        real_scandir = os.scandir
+
+        def deny(path):
+            if str(path) in (str(tmp_path / "locked"), str(tmp_path / "missing")):
+                raise PermissionError(path)
+            return real_scandir(path)
+
+        with patch("src.infrastructure.analyzer.file_walker.os.scandir", side_effect=deny):
+            assert [e.name for e in iter_project_files(tmp_path, set(), strict_root=True)] == ["a.py"]
+            with pytest.raises(PermissionError):
+                list(iter_project_files(tmp_path / "missing", set(), strict_root=True))
+
+
+class TestIsGeneratedFile:
+    """is_generated_file: header markers of generated code."""
+
+    def test_markers_detected(self, tmp_path: Path):
+        for name, header in [
+            ("g0.py", "# @generated by protoc"),
+            ("g1.ts", "// Code generated. DO NOT EDIT."),
+            ("g2.py", "#!/usr/bin/env python\n# -*- coding: utf-8 -*-\n# Auto-generated"),
+            ("g3.js", "  // autogenerated file"),
+        ]:
+            f = tmp_path / name
+            f.write_text(header + "\nx = 1\n")
+            assert is_generated_file(f), name
+
+    def test_marker_outside_comment_ignored(self, tmp_path: Path):
+        """Docstrings, string literals and the other language's comment prefix do not count."""
+        for name, content in [
+            ("doc.py", '"""Helpers for auto-generated clients. Do not edit the output by hand."""\nx = 1\n'),
+            ("lit.py", "BANNER = '# @generated'\n"),
+            ("slash.py", "x = 1\n// DO NOT EDIT\n"),
+            ("hash.ts", "# @generated\nexport const x = 1;\n"),
+        ]:
+            f = tmp_path / name
+            f.write_text(content)
+            assert not is_generated_file(f), name
+
+    def test_non_code_files_not_checked(self, tmp_path: Path):
+        """Markdown/config files are never treated as generated."""
+        for name in ("README.md", "config.yaml"):
+            f = tmp_path / name
+            f.write_text("# DO NOT EDIT\n")
+            assert not is_generated_file(f), name
+
+    def test_marker_past_header_ignored(self, tmp_path: Path):
+        f = tmp_path / "m.py"
+        f.write_text("x = 1\n" * 100 + "# DO NOT EDIT\n")
+        assert not is_generated_file(f)
+        f.write_text("x = 1\n" * 5 + "# DO NOT EDIT\n")
+        assert not is_generated_file(f)
+
+    def test_missing_file_not_generated(self, tmp_path: Path):
+        assert not is_generated_file(tmp_path / "nope.py")
+
+
+class TestCollectorsUseWalker:
+    """ProjectAnalyzer and dependency graph collectors skip ignored trees."""
+
+    def test_collectors_skip_venv(self, tmp_path: Path):
+        (tmp_path / ".venv" / "lib").mkdir(parents=True)
+        (tmp_path / ".venv" / "lib" / "site.py").write_text("")
+        (tmp_path / "main.py").write_text("")
+        (tmp_path / "ui.ts").write_text("")
+
+        files = ProjectAnalyzer()._collect_files(tmp_path)
+        assert {f.name for f in files} == {"main.py", "ui.ts"}
+
+        py_files, ts_files = _collect_code_files(tmp_path)
+        assert [f.name for f in py_files] == ["main.py"]
+        assert [f.name for f in ts_files] == ["ui.ts"]
+
+    def test_graph_collection_stops_at_cap(self, tmp_path: Path):
+        """Dependency graph collection keeps at most max_files and stops walking."""
+        for i in range(5):
+            (tmp_path / f"m{i}.py").write_text("")
+        (tmp_path / "sub").mkdir()
+        (tmp_path / "sub" / "app.ts").write_text("")
+        with patch("src.infrastructure.analyzer.file_walker.os.scandir", wraps=os.scandir) as scandir:
+            py_files, ts_files = _collect_code_files(tmp_path, max_files=3)
+        assert len(py_files) + len(ts_files) == 3
+        assert scandir.call_count == 1
+
+    def test_project_analyzer_unreadable_root(self, tmp_path: Path):
+        """Unreadable project root is reported as ValueError by analyze()."""
+        with (
+            patch("src.infrastructure.analyzer.file_walker.os.scandir", side_effect=PermissionError("denied")),
+            pytest.raises(ValueError, match="No read permission"),
+        ):
+            ProjectAnalyzer().analyze(str(tmp_path))
+
+    def test_project_analyzer_keeps_docstring_mention(self, tmp_path: Path):
+        """A module whose docstring mentions auto-generated code is still analyzed and scanned."""
+        (tmp_path / "client.py").write_text(
+            '"""Wrapper around the auto-generated API client. DO NOT EDIT the generated part."""\n\neval(data)\n'
+        )
+        analysis = ProjectAnalyzer().analyze(str(tmp_path))
+        assert [m.path for m in analysis.file_metrics] == ["client.py"]
+        assert any(i.file == "client.py" for i in analysis.security_issues)
+
+    def test_project_analyzer_skips_generated(self, tmp_path: Path):
+        (tmp_path / "main.py").write_text("x = 1\n")
+        (tmp_path / "api_pb2.py").write_text("# -*- coding: utf-8 -*-\n# Generated code. DO NOT EDIT!\n")
+        files = ProjectAnalyzer()._collect_files(tmp_path)
+        assert [f.name for f in files] == ["main.py"]
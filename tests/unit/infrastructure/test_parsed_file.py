@@ -0,0 +1,117 @@
+"""Tests for parsed_file (ParsedFileCache shared across analyzers)."""
+
+import ast
+import os
+from pathlib import Path
+from unittest.mock import patch
+
+from src.infrastructure.analyzer.dependency_graph import build_dependency_graph
+from src.infrastructure.analyzer.file_metrics import compute_file_metrics
+from src.infrastructure.analyzer.parsed_file import ParsedFileCache
+from src.infrastructure.analyzer.project_analyzer import ProjectAnalyzer
+
+
+class TestParsedFileCache:
+    """ParsedFileCache: read and parse each file once."""
+
+    def test_python_file_parsed(self, tmp_path: Path):
+        """Python file yields content and AST."""
+        f = tmp_path / "m.py"
+        f.write_text("import os\n")
+        parsed = ParsedFileCache().get(f)
+        assert parsed is not None
+        assert parsed.content == "import os\n"
+        assert isinstance(parsed.tree, ast.Module)
+        assert parsed.syntax_error is False
+
+    def test_non_python_file_has_no_tree(self, tmp_path: Path):
+        """Non-Python file is read but not parsed."""
+        f = tmp_path / "readme.md"
+        f.write_text("# Title\n")
+        parsed = ParsedFileCache().get(f)
+        assert parsed is not None
+        assert parsed.tree is None
+        assert parsed.syntax_error is False
+
+    def test_syntax_error_flagged(self, tmp_path: Path):
+        """Broken Python sets syntax_error instead of raising."""
+        f = tmp_path / "bad.py"
+        f.write_text("def (\n")
+        parsed = ParsedFileCache().get(f)
+        assert parsed is not None
+        assert parsed.tree is None
+        assert parsed.syntax_error is True
+
+    def test_missing_file_returns_none(self, tmp_path: Path):
+        """Unreadable file returns None."""
+        assert ParsedFileCache().get(tmp_path / "nope.py") is None
+
+    def test_same_object_returned(self, tmp_path: Path):
+        """Repeated get returns the cached entry."""
+        f = tmp_path / "m.py"
+        f.write_text("x = 1\n")
+        cache = ParsedFileCache()
+        assert cache.get(f) is cache.get(f)
+
+    def test_oldest_entry_evicted_over_limit(self, tmp_path: Path):
+        """Entries beyond the size limit are dropped least recently used first."""
+        files = []
+        for name in ("a.py", "b.py", "c.py"):
+            (tmp_path / name).write_text("x = 1\n")
+            files.append(tmp_path / name)
+        cache = ParsedFileCache(max_chars=12)
+        first_a = cache.get(files[0])
+        cache.get(files[1])
+        assert cache.get(files[0]) is first_a  # a is now the most recent
+        cache.get(files[2])  # evicts b
+        assert cache.get(files[0]) is first_a
+        with patch.object(Path, "read_text", autospec=True, side_effect=Path.read_text) as read_text:
+            cache.get(files[1])
+        assert read_text.call_count == 1
+
+    def test_modified_file_reparsed(self, tmp_path: Path):
+        """Changed mtime/size invalidates the entry."""
+        f = tmp_path / "m.py"
+        f.write_text("x = 1\n")
+        cache = ParsedFileCache()
+        first = cache.get(f)
+        f.write_text("x = 1\ny = 2\n")
+        st = f.stat()
+        os.utime(f, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+        second = cache.get(f)
+        assert second is not first
+        assert second is not None
+        assert "y = 2" in second.content
+
+    def test_shared_cache_parses_once(self, tmp_path: Path):
+        """Metrics and dependency graph share one parse per file."""
+        (tmp_path / "a.py").write_text("import b\n")
+        (tmp_path / "b.py").write_text("shared_marker = 1\n")
+        cache = ParsedFileCache()
+        with patch("src.infrastructure.analyzer.parsed_file.ast.parse", wraps=ast.parse) as parse:
+            compute_file_metrics(tmp_path / "a.py", tmp_path, cache)
+            compute_file_metrics(tmp_path / "b.py", tmp_path, cache)
+            result = build_dependency_graph(tmp_path, cache)
+        sources = [c.args[0] for c in parse.call_args_list if c.args[0] in ("import b\n", "shared_marker = 1\n")]
+        assert len(sources) == 2
+        assert result.edge_count == 1
+
+    def test_project_analyzer_parses_each_file_once(self, tmp_path: Path):
+        """ProjectAnalyzer.analyze parses each Python file once per run."""
+        (tmp_path / "main.py").write_text("import os\n\ndef main():\n    pass\n")
+        (tmp_path / "util.py").write_text("def helper():\n    return 1\n")
+        with patch("src.infrastructure.analyzer.parsed_file.ast.parse", wraps=ast.parse) as parse:
+            analysis = ProjectAnalyzer().analyze(str(tmp_path))
+        sources = [c.args[0] for c in parse.call_args_list if "def main" in c.args[0] or "def helper" in c.args[0]]
+        assert len(sources) == 2
+        assert analysis.total_files == 2
+
+    def test_project_analyzer_reads_each_file_once(self, tmp_path: Path):
+        """Metrics, security scan and smells share one read per file."""
+        (tmp_path / "main.py").write_text("import os\n\ndef main():\n    eval('1')\n")
+        (tmp_path / "app.js").write_text("const x = 1;\n")
+        with patch.object(Path, "read_text", autospec=True, side_effect=Path.read_text) as read_text:
+            analysis = ProjectAnalyzer().analyze(str(tmp_path))
+        read_names = sorted(c.args[0].name for c in read_text.call_args_list)
+        assert read_names == ["app.js", "main.py"]
+        assert analysis.security_issues
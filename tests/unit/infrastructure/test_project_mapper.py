@@ -0,0 +1,285 @@
+"""Tests for project mapper."""
+
+import json
+from dataclasses import asdict
+from pathlib import Path
+
+import pytest
+
+from src.infrastructure.agents.project_mapper import (
+    analyze_file,
+    build_project_map,
+    build_project_map_async,
+    load_project_map,
+    save_project_map,
+)
+
+PY_SOURCE = '''"""Module doc."""
+import os
+from typing import Optional
+
+
+class Service(Base):
+    """Service doc."""
+
+    def run(self, x: int) -> str:
+        return str(x)
+
+
+@decorator
+async def fetch(url: str, timeout: float = 1.0) -> Optional[str]:
+    """Fetch url."""
+    return None
+'''
+
+
+def _sample_map():
+    return build_project_map(Path("/project"), [("pkg/service.py", PY_SOURCE)])
+
+
+class TestProjectMapSerialization:
+    """Tests for ProjectMap serialization."""
+
+    def test_to_dict_matches_asdict(self):
+        """Manual to_dict produces the same structure as dataclasses.asdict."""
+        project_map = _sample_map()
+        assert project_map.to_dict() == asdict(project_map)
+
+    def test_save_and_load_roundtrip(self, tmp_path):
+        """Saved project map loads back unchanged."""
+        project_map = _sample_map()
+        save_project_map(project_map, str(tmp_path))
+        loaded = load_project_map(str(tmp_path))
+        assert loaded is not None
+        assert loaded.to_dict() == project_map.to_dict()
+
+    def test_to_json_matches_to_dict(self, monkeypatch):
+        """Direct dataclass encoding yields the same JSON data as to_dict (orjson and stdlib)."""
+        import json
+
+        from src.infrastructure.agents import project_mapper
+
+        project_map = _sample_map()
+        assert json.loads(project_map.to_json()) == project_map.to_dict()
+        monkeypatch.setattr(project_mapper, "orjson", None)
+        assert json.loads(project_map.to_json()) == project_map.to_dict()
+
+    def test_roundtrip_without_orjson(self, tmp_path, monkeypatch):
+        """Stdlib json fallback writes a map that loads back unchanged."""
+        from src.infrastructure.agents import project_mapper
+
+        monkeypatch.setattr(project_mapper, "orjson", None)
+        project_map = _sample_map()
+        save_project_map(project_map, str(tmp_path))
+        loaded = load_project_map(str(tmp_path))
+        assert loaded is not None
+        assert loaded.to_dict() == project_map.to_dict()
+
+
+class TestBuildProjectMapAsync:
+    """Tests for the async project map builder."""
+
+    @pytest.mark.asyncio
+    async def test_matches_sync_build(self):
+        """Async build produces the same map as the sync build."""
+        files = [("pkg/service.py", PY_SOURCE), ("src/App.tsx", "export function App() {}\n")]
+        project_map = await build_project_map_async(Path("/project"), files)
+        assert project_map.to_dict() == build_project_map(Path("/project"), files).to_dict()
+
+
+class TestAnalysisCache:
+    """Tests for the per-file analysis cache."""
+
+    def test_unchanged_file_reuses_cached_analysis(self, tmp_path, monkeypatch):
+        """Second build with same content does not re-analyze the file."""
+        from src.infrastructure.agents import project_mapper
+
+        files = [("pkg/service.py", PY_SOURCE)]
+        first = build_project_map(Path("/project"), files, cache_dir=str(tmp_path))
+        assert (tmp_path / project_mapper.ANALYSIS_CACHE_FILENAME).exists()
+
+        def fail(*args, **kwargs):
+            raise AssertionError("analyze_file should not be called on cache hit")
+
+        monkeypatch.setattr(project_mapper, "analyze_file", fail)
+        second = build_project_map(Path("/project"), files, cache_dir=str(tmp_path))
+        assert second.to_dict() == first.to_dict()
+
+    def test_changed_file_is_reanalyzed(self, tmp_path):
+        """Changed content invalidates the cache entry."""
+        build_project_map(Path("/project"), [("a.py", "def old(): pass\n")], cache_dir=str(tmp_path))
+        project_map = build_project_map(Path("/project"), [("a.py", "def new(): pass\n")], cache_dir=str(tmp_path))
+        assert [f.name for f in project_map.files[0].functions] == ["new"]
+
+    def test_other_version_ignored(self, tmp_path, monkeypatch):
+        """A cache written with another version (or unversioned) is not used."""
+        from src.infrastructure.agents import project_mapper
+
+        files = [("a.py", "def f(): pass\n")]
+        build_project_map(Path("/project"), files, cache_dir=str(tmp_path))
+        monkeypatch.setattr(project_mapper, "ANALYSIS_CACHE_VERSION", project_mapper.ANALYSIS_CACHE_VERSION + 1)
+        calls = []
+        real_analyze = project_mapper.analyze_file
+        monkeypatch.setattr(project_mapper, "analyze_file", lambda *a: calls.append(a) or real_analyze(*a))
+        build_project_map(Path("/project"), files, cache_dir=str(tmp_path))
+        assert len(calls) == 1
+
+        # Old format: {rel_path: {"hash", "info"}} without a version key
+        stale = {"a.py": {"hash": project_mapper._content_hash(files[0][1]), "info": {"path": "a.py"}}}
+        (tmp_path / project_mapper.ANALYSIS_CACHE_FILENAME).write_text(json.dumps(stale))
+        project_map = build_project_map(Path("/project"), files, cache_dir=str(tmp_path))
+        assert len(calls) == 2
+        assert [f.name for f in project_map.files[0].functions] == ["f"]
+
+    def test_warm_build_matches_cold_build(self, tmp_path):
+        """Nested defs and function-local imports are treated the same with and without the cache."""
+        source = "import os\n\ndef outer():\n    import re\n\n    def inner():\n        pass\n"
+        files = [("a.py", source)]
+        cold = build_project_map(Path("/project"), files)
+        build_project_map(Path("/project"), files, cache_dir=str(tmp_path))
+        warm = build_project_map(Path("/project"), files, cache_dir=str(tmp_path))
+        assert warm.to_dict() == cold.to_dict()
+        assert warm.files[0].imports == ["os"]
+        assert [f.name for f in warm.files[0].functions] == ["outer"]
+
+    def test_roots_cached_separately(self, tmp_path, monkeypatch):
+        """Building another project keeps the first project's entries."""
+        from src.infrastructure.agents import project_mapper
+
+        files = [("a.py", "def f(): pass\n")]
+        build_project_map(Path("/one"), files, cache_dir=str(tmp_path))
+        build_project_map(Path("/two"), [("b.py", "x = 1\n")], cache_dir=str(tmp_path))
+
+        def fail(*args, **kwargs):
+            raise AssertionError("analyze_file should not be called on cache hit")
+
+        monkeypatch.setattr(project_mapper, "analyze_file", fail)
+        build_project_map(Path("/one"), files, cache_dir=str(tmp_path))
+
+    def test_oldest_root_dropped(self, tmp_path, monkeypatch):
+        """At most MAX_CACHED_ROOTS roots are kept; the least recently built goes first."""
+        from src.infrastructure.agents import project_mapper
+
+        monkeypatch.setattr(project_mapper, "MAX_CACHED_ROOTS", 2)
+        for root in ("/one", "/two", "/one", "/three"):
+            build_project_map(Path(root), [("a.py", "x = 1\n")], cache_dir=str(tmp_path))
+        assert list(project_mapper._load_analysis_cache(str(tmp_path))) == ["/one", "/three"]
+
+
+TS_SOURCE = """import React from 'react';
+import {
+  useState,
+  useEffect,
+} from "react";
+import './styles.css';
+
+export const API_URL = 'http://localhost';
+
+export default function App() {
+  return null;
+}
+
+export async function fetchData(url: string) {}
+
+export class Store extends BaseStore {}
+
+class Helper<T> extends Base {
+  run() {}
+}
+
+function local() {}
+"""
+
+
+class TestTypeScriptAnalysis:
+    """Tests for TS/JS structure extraction."""
+
+    def test_extracts_declarations(self):
+        """Imports, exports, classes and functions are found."""
+        info = analyze_file(Path("src/App.tsx"), TS_SOURCE)
+        assert info.language == "typescript"
+        assert info.imports == ["react", "react"]
+        assert info.exports == ["API_URL", "function App", "function fetchData", "class Store"]
+        assert [(c.name, c.bases) for c in info.classes] == [("Store", ["BaseStore"]), ("Helper", ["Base"])]
+        assert [(f.name, f.is_async) for f in info.functions] == [
+            ("App", False),
+            ("fetchData", True),
+            ("local", False),
+        ]
+
+
+class TestProjectMapMarkdown:
+    """Tests for markdown rendering."""
+
+    def test_groups_files_by_directory(self):
+        """Files are listed under their directory headings."""
+        project_map = build_project_map(
+            Path("/project"),
+            [("main.py", "def main(): pass\n"), ("pkg/service.py", PY_SOURCE), ("pkg/util.py", "")],
+        )
+        md = project_map.to_markdown()
+        assert md.startswith("# Project Map: /project")
+        assert "### Root" in md
+        assert md.index("### pkg/") < md.index("**service.py** (python)") < md.index("**util.py** (python)")
+        assert "- Class `Service(Base)`" in md
+        assert "- `async fetch(url: str, timeout: float) -> Optional[str]`" in md
+
+
+class TestPythonAnalysis:
+    """Tests for Python structure extraction."""
+
+    def test_identical_content_analyzed_once(self):
+        """Duplicate content at different paths reuses the analysis but keeps each path."""
+        from src.infrastructure.agents.project_mapper import _analyze_content
+
+        _analyze_content.cache_clear()
+        first = analyze_file(Path("a/__init__.py"), "from .x import y\n")
+        second = analyze_file(Path("b/__init__.py"), "from .x import y\n")
+        assert (first.path, second.path) == ("a/__init__.py", "b/__init__.py")
+        assert first.imports == second.imports == ["x.y"]
+        assert _analyze_content.cache_info().hits == 1
+
+    def test_only_module_level_definitions(self):
+        """Methods and nested defs are not reported as top-level; guarded imports are."""
+        source = (
+            "import os\n"
+            "try:\n"
+            "    import ujson as json\n"
+            "except ImportError:\n"
+            "    import json\n"
+            "if True:\n"
+            "    def conditional(): pass\n"
+            "class A:\n"
+            "    class Inner: pass\n"
+            "    def method(self):\n"
+            "        import re\n"
+            "def outer():\n"
+            "    def inner(): pass\n"
+        )
+        info = analyze_file(Path("m.py"), source)
+        assert info.imports == ["os", "ujson", "json"]
+        assert [c.name for c in info.classes] == ["A"]
+        assert info.classes[0].methods == ["method"]
+        assert [f.name for f in info.functions] == ["conditional", "outer"]
+
+    def test_annotations_match_ast_unparse(self):
+        """Fast annotation rendering agrees with ast.unparse."""
+        source = (
+            "import typing\n"
+            "@app.get('/x')\n"
+            "@staticmethod\n"
+            "def f(a: int, b: typing.Optional[str], c: 'Foo', d: None, e: dict[str, list[int]], f) -> os.PathLike:\n"
+            "    pass\n"
+        )
+        info = analyze_file(Path("m.py"), source)
+        func = info.functions[0]
+        assert func.args == [
+            "a: int",
+            "b: typing.Optional[str]",
+            "c: 'Foo'",
+            "d: None",
+            "e: dict[str, list[int]]",
+            "f",
+        ]
+        assert func.returns == "os.PathLike"
+        assert func.decorators == ["app.get('/x')", "staticmethod"]
@@ -238,6 +238,21 @@ class TestChromaDBRAGAdapter:
             # Embeddings should have been called
             mock_embeddings.embed_batch.assert_called()
 
+    @pytest.mark.asyncio
+    async def test_project_map_uses_output_dir(self, config, mock_embeddings, tmp_path):
+        """Project map and its analysis cache are written to the configured output dir."""
+        out = tmp_path / "out"
+        adapter = ChromaDBRAGAdapter(config, mock_embeddings, output_dir=str(out))
+        project = tmp_path / "proj"
+        project.mkdir()
+        (project / "code.py").write_text("def hello(): pass\n")
+
+        await adapter.index_path(str(project))
+
+        assert (out / "project_map.json").exists()
+        assert (out / "file_analysis_cache.json").exists()
+        assert "hello" in (adapter.get_project_map_markdown() or "")
+
     @pytest.mark.asyncio
     async def test_index_empty_directory(self, adapter):
         """Indexing empty directory doesn't fail."""
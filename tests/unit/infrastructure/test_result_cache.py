@@ -0,0 +1,185 @@
+"""Tests for result_cache (persistent per-file analysis results)."""
+
+import os
+import sqlite3
+from pathlib import Path
+from unittest.mock import patch
+
+from src.infrastructure.analyzer.dependency_graph import build_dependency_graph
+from src.infrastructure.analyzer.project_analyzer import ProjectAnalyzer
+from src.infrastructure.analyzer.result_cache import RESULT_CACHE_FILENAME, AnalysisResultCache, content_digest
+
+
+class TestAnalysisResultCache:
+    """AnalysisResultCache: SQLite store keyed by path and content hash."""
+
+    def test_roundtrip(self, tmp_path: Path):
+        """Stored value is returned for a matching digest, across connections."""
+        with AnalysisResultCache(tmp_path) as store:
+            store.put_many("file", [("/p/a.py", "d1", {"x": [1, 2]})])
+        with AnalysisResultCache(tmp_path) as store:
+            assert store.get_many("file", {"/p/a.py": "d1"}) == {"/p/a.py": {"x": [1, 2]}}
+
+    def test_digest_mismatch_is_miss(self, tmp_path: Path):
+        """Changed content (new digest) is not served from cache."""
+        with AnalysisResultCache(tmp_path) as store:
+            store.put_many("file", [("/p/a.py", "d1", 1)])
+            assert store.get_many("file", {"/p/a.py": "d2"}) == {}
+
+    def test_kinds_are_separate(self, tmp_path: Path):
+        """Same path under another kind is a miss."""
+        with AnalysisResultCache(tmp_path) as store:
+            store.put_many("file", [("/p/a.py", "d1", 1)])
+            assert store.get_many("py_imports", {"/p/a.py": "d1"}) == {}
+
+    def test_unusable_dir_disables_cache(self, tmp_path: Path):
+        """Cache dir that cannot be created makes the cache a no-op."""
+        blocker = tmp_path / "file"
+        blocker.write_text("")
+        with AnalysisResultCache(blocker / "sub") as store:
+            store.put_many("file", [("/p/a.py", "d1", 1)])
+            assert store.get_many("file", {"/p/a.py": "d1"}) == {}
+
+    def test_stamp_lookup(self, tmp_path: Path):
+        """Value is served by matching stamp; rows stored without a stamp never match."""
+        with AnalysisResultCache(tmp_path) as store:
+            store.put_many("file", [("/p/a.py", "d1", 1), ("/p/b.py", "d2", 2)], {"/p/a.py": "10:5"})
+            assert store.get_unchanged("file", {"/p/a.py": "10:5", "/p/b.py": ""}) == {"/p/a.py": 1}
+            assert store.get_unchanged("file", {"/p/a.py": "11:5"}) == {}
+
+    def test_old_schema_migrated(self, tmp_path: Path):
+        """Database created before the stamp column keeps working."""
+        conn = sqlite3.connect(tmp_path / RESULT_CACHE_FILENAME)
+        conn.execute(
+            "CREATE TABLE results (kind TEXT NOT NULL, path TEXT NOT NULL, digest TEXT NOT NULL, "
+            "value BLOB NOT NULL, PRIMARY KEY (kind, path))"
+        )
+        conn.commit()
+        conn.close()
+        with AnalysisResultCache(tmp_path) as store:
+            store.put_many("file", [("/p/a.py", "d1", 1)], {"/p/a.py": "1:1"})
+            assert store.get_unchanged("file", {"/p/a.py": "1:1"}) == {"/p/a.py": 1}
+
+    def test_version_bump_invalidates(self, tmp_path: Path, monkeypatch):
+        """Entries written under another CACHE_VERSION are not served."""
+        from src.infrastructure.analyzer import result_cache
+
+        with AnalysisResultCache(tmp_path) as store:
+            store.put_many("ts_imports", [("/p/a.ts", "d1", ["./old"])], {"/p/a.ts": "1:1"})
+        monkeypatch.setattr(result_cache, "CACHE_VERSION", result_cache.CACHE_VERSION + 1)
+        with AnalysisResultCache(tmp_path) as store:
+            assert store.get_many("ts_imports", {"/p/a.ts": "d1"}) == {}
+            assert store.get_unchanged("ts_imports", {"/p/a.ts": "1:1"}) == {}
+
+    def test_version_bump_removes_old_rows(self, tmp_path: Path, monkeypatch):
+        """Rows written under another CACHE_VERSION are deleted when the cache is opened."""
+        from src.infrastructure.analyzer import result_cache
+
+        with AnalysisResultCache(tmp_path) as store:
+            store.put_many("file", [("/p/a.py", "d1", 1)])
+        monkeypatch.setattr(result_cache, "CACHE_VERSION", result_cache.CACHE_VERSION + 1)
+        AnalysisResultCache(tmp_path).close()
+        conn = sqlite3.connect(tmp_path / RESULT_CACHE_FILENAME)
+        assert conn.execute("SELECT COUNT(*) FROM results").fetchone() == (0,)
+        conn.close()
+
+    def test_prune_keeps_listed_and_other_roots(self, tmp_path: Path):
+        """Prune drops only unlisted paths under the prefix for the given kind."""
+        with AnalysisResultCache(tmp_path) as store:
+            store.put_many("file", [("/p/a.py", "d1", 1), ("/p/b.py", "d2", 2), ("/q/c.py", "d3", 3)])
+            store.put_many("py_imports", [("/p/b.py", "d2", [])])
+            store.prune("file", "/p/", {"/p/a.py"})
+            assert store.get_many("file", {"/p/a.py": "d1", "/p/b.py": "d2", "/q/c.py": "d3"}) == {
+                "/p/a.py": 1,
+                "/q/c.py": 3,
+            }
+            assert store.get_many("py_imports", {"/p/b.py": "d2"}) == {"/p/b.py": []}
+
+    def test_content_digest_changes_with_content(self):
+        """Digest differs for different content."""
+        assert content_digest("a") != content_digest("b")
+        assert content_digest("a") == content_digest("a")
+
+
+class TestIncrementalAnalysis:
+    """ProjectAnalyzer and build_dependency_graph reuse cached per-file results."""
+
+    def test_unchanged_files_not_reanalyzed(self, tmp_path: Path):
+        """Second run analyzes only the modified file and gives the same result."""
+        project = tmp_path / "proj"
+        project.mkdir()
+        (project / "a.py").write_text("import os\n\ndef a():\n    eval('1')\n")
+        (project / "b.py").write_text("def b():\n    pass\n")
+        analyzer = ProjectAnalyzer(cache_dir=tmp_path / "cache")
+
+        first = analyzer.analyze(str(project))
+        with patch("src.infrastructure.analyzer.project_analyzer._analyze_file") as worker:
+            second = analyzer.analyze(str(project))
+        worker.assert_not_called()
+        assert second.file_metrics == first.file_metrics
+        assert second.security_issues == first.security_issues
+
+        (project / "b.py").write_text("def b():\n    pass\n\ndef c():\n    pass\n")
+        third = analyzer.analyze(str(project))
+        b_metrics = next(m for m in third.file_metrics if m.path == "b.py")
+        assert b_metrics.functions == 2
+
+    def test_untouched_files_not_read(self, tmp_path: Path):
+        """Files with the same mtime and size are served without reading; a touched file is hashed."""
+        project = tmp_path / "proj"
+        project.mkdir()
+        (project / "a.py").write_text("def a():\n    pass\n")
+        (project / "b.py").write_text("def b():\n    pass\n")
+        analyzer = ProjectAnalyzer(cache_dir=tmp_path / "cache")
+        first = analyzer.analyze(str(project))
+
+        st = (project / "b.py").stat()
+        os.utime(project / "b.py", ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+        with (
+            patch.object(Path, "read_text", autospec=True, side_effect=Path.read_text) as read_text,
+            patch("src.infrastructure.analyzer.project_analyzer._analyze_file") as worker,
+        ):
+            second = analyzer.analyze(str(project))
+        worker.assert_not_called()
+        assert [c.args[0].name for c in read_text.call_args_list] == ["b.py"]
+        assert second.file_metrics == first.file_metrics
+
+        with patch.object(Path, "read_text", autospec=True, side_effect=Path.read_text) as read_text:
+            analyzer.analyze(str(project))
+        read_text.assert_not_called()
+
+    def test_dependency_graph_uses_cache(self, tmp_path: Path):
+        """Second build takes imports from cache without parsing and keeps edges."""
+        project = tmp_path / "proj"
+        project.mkdir()
+        (project / "a.py").write_text("import b\nimport os\n")
+        (project / "b.py").write_text("import a\n")
+        cache_dir = tmp_path / "cache"
+
+        first = build_dependency_graph(project, cache_dir=cache_dir)
+        with patch("src.infrastructure.analyzer.dependency_graph._python_file_imports") as compute:
+            second = build_dependency_graph(project, cache_dir=cache_dir)
+        compute.assert_not_called()
+        assert second.edges == first.edges
+        assert second.cycles == first.cycles
+        assert second.unused_imports == first.unused_imports
+        assert ("a.py", "os") in second.unused_imports
+
+    def test_deleted_file_leaves_no_rows(self, tmp_path: Path):
+        """Rows for a file removed from the project are pruned on the next full run."""
+        project = tmp_path / "proj"
+        project.mkdir()
+        (project / "a.py").write_text("import b\n")
+        (project / "b.py").write_text("def b():\n    pass\n")
+        cache_dir = tmp_path / "cache"
+        ProjectAnalyzer(cache_dir=cache_dir).analyze(str(project))
+        build_dependency_graph(project, cache_dir=cache_dir)
+
+        (project / "b.py").unlink()
+        ProjectAnalyzer(cache_dir=cache_dir).analyze(str(project))
+        build_dependency_graph(project, cache_dir=cache_dir)
+        conn = sqlite3.connect(cache_dir / RESULT_CACHE_FILENAME)
+        paths = [path for (path,) in conn.execute("SELECT path FROM results")]
+        conn.close()
+        assert paths
+        assert not [path for path in paths if path.endswith("b.py")]
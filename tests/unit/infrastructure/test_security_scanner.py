@@ -3,6 +3,7 @@
 from pathlib import Path
 
 from src.infrastructure.analyzer.security_scanner import (
+    MAX_ISSUES_PER_FILE,
     SECURITY_PATTERNS,
     check_file_security,
 )
@@ -43,3 +44,44 @@ class TestCheckFileSecurity:
         assert len(SECURITY_PATTERNS) > 0
         for item in SECURITY_PATTERNS:
             assert len(item) == 4  # pattern, severity, issue, recommendation
+
+    def test_line_numbers_and_order(self, tmp_path: Path):
+        """Issues are reported per line in line order, several patterns per line allowed."""
+        (tmp_path / "app.py").write_text("import os\n\nos.system(eval(cmd))\nx = 1  # TODO: later\n")
+        issues = check_file_security(tmp_path / "app.py", tmp_path)
+        assert [(i.line, i.issue) for i in issues] == [
+            (3, "Вызов eval()"),
+            (3, "Выполнение OS-команд"),
+            (4, "Маркер TODO/FIXME"),
+        ]
+
+    def test_comment_and_docstring_lines_skipped(self, tmp_path: Path):
+        """Lines starting with a comment or triple quotes are not scanned."""
+        (tmp_path / "app.py").write_text("# eval(x)\n'''eval(y)\n'''\n    // eval(z)\nval = obj.exec(q)\n")
+        assert check_file_security(tmp_path / "app.py", tmp_path) == []
+
+    def test_call_split_across_lines_matches_line_scan(self, tmp_path: Path):
+        """A match spanning lines counts only where a single line matches on its own."""
+        (tmp_path / "app.py").write_text("x = eval(\n    data\n)\ny = eval(\nz, eval(w))\n")
+        issues = check_file_security(tmp_path / "app.py", tmp_path)
+        assert [i.line for i in issues] == [5]
+
+    def test_keyword_screen_is_case_insensitive(self, tmp_path: Path):
+        """Pre-screen by keyword keeps IGNORECASE matches such as EVAL() and Password=."""
+        (tmp_path / "app.py").write_text("x = EVAL(data)\nPassword = 'hunter2hunter2'\n")
+        issues = check_file_security(tmp_path / "app.py", tmp_path)
+        assert [i.issue for i in issues] == ["Вызов eval()", "Пароль в коде"]
+
+    def test_unclosed_calls_stay_line_local(self, tmp_path: Path):
+        """Unclosed eval( on many lines neither matches nor scans ahead to later lines."""
+        (tmp_path / "app.py").write_text("eval(a\n" * 5000 + "eval(b)\n")
+        issues = check_file_security(tmp_path / "app.py", tmp_path)
+        assert [i.line for i in issues] == [5001]
+
+    def test_issues_capped_per_file(self, tmp_path: Path):
+        """At most MAX_ISSUES_PER_FILE issues, the first ones by line; skipped lines do not count."""
+        lines = ["# TODO: in a comment"] * 10 + [f"x = eval(v{i})  # TODO: fix" for i in range(MAX_ISSUES_PER_FILE)]
+        (tmp_path / "app.py").write_text("\n".join(lines) + "\n")
+        issues = check_file_security(tmp_path / "app.py", tmp_path)
+        assert len(issues) == MAX_ISSUES_PER_FILE
+        assert [i.line for i in issues] == [n for n in range(11, 11 + MAX_ISSUES_PER_FILE // 2) for _ in range(2)]
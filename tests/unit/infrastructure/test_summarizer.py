@@ -0,0 +1,90 @@
+"""Tests for summarizer agent."""
+
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from src.domain.ports.llm import LLMResponse
+from src.infrastructure.agents import summarizer
+from src.infrastructure.agents.summarizer import summarize_chunks, summarize_content
+
+
+@pytest.fixture
+def mock_llm():
+    """Mock LLM returning a fixed summary."""
+    llm = MagicMock()
+    llm.generate = AsyncMock(return_value=LLMResponse(content="short summary", model="test-model"))
+    return llm
+
+
+@pytest.fixture(autouse=True)
+def isolated_cache(tmp_path, monkeypatch):
+    """Point the summary cache at a temporary database."""
+    monkeypatch.setattr(summarizer, "_cache_file", tmp_path / "summary_cache.db")
+    monkeypatch.setattr(summarizer, "_legacy_cache_file", tmp_path / "summary_cache.json")
+    monkeypatch.setattr(summarizer, "_cache_conn", None)
+    monkeypatch.setattr(summarizer, "_summary_cache", {})
+    yield
+    if summarizer._cache_conn is not None:
+        summarizer._cache_conn.close()
+
+
+class TestSummarizeContent:
+    """Tests for summarize_content caching."""
+
+    @pytest.mark.asyncio
+    async def test_second_call_hits_cache(self, mock_llm):
+        """Same content is summarized by the LLM only once."""
+        first = await summarize_content("def f(): pass", mock_llm, "test-model")
+        second = await summarize_content("def f(): pass", mock_llm, "test-model")
+        assert first == second == "short summary"
+        assert mock_llm.generate.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_cache_persists_across_connections(self, mock_llm, monkeypatch):
+        """Cached summaries survive reopening the database."""
+        await summarize_content("class A: pass", mock_llm, "test-model")
+        summarizer._cache_conn.close()
+        monkeypatch.setattr(summarizer, "_cache_conn", None)
+        monkeypatch.setattr(summarizer, "_summary_cache", {})
+        await summarize_content("class A: pass", mock_llm, "test-model")
+        assert mock_llm.generate.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_repeat_lookup_served_from_memory(self, mock_llm):
+        """Once seen, a summary is returned without touching the database."""
+        await summarize_content("y = 2", mock_llm, "test-model")
+        summarizer._cache_conn.close()  # any further query would raise ProgrammingError
+        assert await summarize_content("y = 2", mock_llm, "test-model") == "short summary"
+        assert mock_llm.generate.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_legacy_json_cache_removed(self, mock_llm):
+        """The stale pre-SQLite JSON cache is deleted when the database is opened."""
+        summarizer._legacy_cache_file.write_text('{"0123456789abcdef": "old"}')
+        await summarize_content("z = 3", mock_llm, "test-model")
+        assert not summarizer._legacy_cache_file.exists()
+        assert summarizer._cache_file.exists()
+
+    @pytest.mark.asyncio
+    async def test_use_cache_false_skips_cache(self, mock_llm):
+        """use_cache=False always calls the LLM."""
+        await summarize_content("x = 1", mock_llm, "test-model", use_cache=False)
+        await summarize_content("x = 1", mock_llm, "test-model", use_cache=False)
+        assert mock_llm.generate.await_count == 2
+
+
+class TestSummarizeChunks:
+    """Tests for summarize_chunks."""
+
+    @pytest.mark.asyncio
+    async def test_groups_by_source(self, mock_llm):
+        """One summary section per source file, in first-seen order."""
+        chunks = [
+            {"source": "a.py", "content": "a1"},
+            {"source": "b.py", "content": "b1"},
+            {"source": "a.py", "content": "a2"},
+        ]
+        result = await summarize_chunks(chunks, mock_llm, "test-model")
+        assert result.index("## a.py") < result.index("## b.py")
+        assert mock_llm.generate.await_count == 2